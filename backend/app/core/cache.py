@@ -0,0 +1,62 @@
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a content-addressed cache key from the given parts
+    None and "" hash the same, mirroring how the prompts treat missing values.
+    Each part is length-prefixed so user text can't shift a part boundary and
+    collide with a different tuple of parts
+    """
+    texts = ("" if part is None else str(part) for part in parts)
+    raw = "".join(f"{len(text)}:{text}" for text in texts)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """
+    🗄️ In-memory LRU cache for parsed AI analysis results
+
+    Values are deep-copied on the way in and out so callers can freely
+    mutate what they get back without corrupting the cached entry.
+    A maxsize of 0 disables caching entirely.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached value, or None on a miss or expired entry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a copy of value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -25,7 +25,12 @@ class Settings(BaseSettings):
     default_ai_provider: str = "google"  # Google Gemini
     max_tokens: int = 4000
     temperature: float = 0.1
-    
+    analysis_cache_size: int = 1024  # Parsed Gemini results kept in memory (0 disables)
+    analysis_cache_ttl_seconds: int = 86400
+    gemini_max_concurrent_requests: int = 8  # In-flight Gemini calls allowed at once
+    resume_analysis_batch_size: int = 2  # Resumes per batched Gemini prompt (clamped to what fits the output limit)
+    resume_analysis_max_concurrent_batches: int = 4
+
     # File Processing
     supported_formats: list = [".pdf", ".doc", ".docx"]
     
@@ -1,14 +1,305 @@
 import google.generativeai as genai
 from app.core.config import settings
-from typing import Dict, List, Optional, Any, Tuple
+from app.core.cache import AnalysisCache, make_cache_key
+from app.services.prompts import (
+    JOB_ANALYSIS_PROMPT,
+    JOB_ENHANCE_AND_ANALYZE_PROMPT,
+    JOB_ENHANCEMENT_PROMPT,
+    JOB_PROMPT_SECTIONS,
+    RESUME_ANALYSIS_PROMPT,
+    RESUME_BATCH_ANALYSIS_PROMPT,
+    RESUME_PROMPT_SECTIONS
+)
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 import json
 import logging
 import asyncio
+import copy
 import re
+from bisect import bisect_left
 from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
+from itertools import islice
+
+try:
+    import orjson  # Optional: much faster decoding of large Gemini payloads
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def json_loads(data: str) -> Any:
+    """Parse JSON with orjson when available, otherwise the standard library"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # Let the stdlib decide - it accepts a few things orjson rejects (e.g. NaN)
+    return json.loads(data)
+
+# Caps concurrent Gemini requests process-wide, however many AIAnalyzer instances exist
+GEMINI_REQUEST_SEMAPHORE = asyncio.Semaphore(settings.gemini_max_concurrent_requests)
+
+# Gemini 2.0 Flash's output ceiling. A batched resume response has to fit under it, so each
+# resume in a batch gets its own share and the batch size is capped to what fits
+GEMINI_MAX_OUTPUT_TOKENS = 8192
+RESUME_BATCH_TOKENS_PER_RESUME = 3000
+MAX_RESUMES_PER_BATCH = max(1, GEMINI_MAX_OUTPUT_TOKENS // RESUME_BATCH_TOKENS_PER_RESUME)
+
+# Output token budgets for the job-side calls; single resume analysis keeps the model's 8000 default.
+# Only the analysis JSON is small enough for a tighter cap - the enhancement calls echo back a
+# whole rewritten job description, so they get the full ceiling
+JOB_ANALYSIS_MAX_OUTPUT_TOKENS = 4000
+JOB_ENHANCEMENT_MAX_OUTPUT_TOKENS = GEMINI_MAX_OUTPUT_TOKENS
+JOB_ENHANCE_AND_ANALYZE_MAX_OUTPUT_TOKENS = GEMINI_MAX_OUTPUT_TOKENS
+
+# Characters that matter when locating a JSON object inside free-form text
+JSON_STRUCTURE_PATTERN = re.compile(r'[{}"\\]')
+
+
+def iter_json_objects(text: str, pos: int = 0):
+    """
+    Yield each balanced top-level {...} object in text from pos onwards, in order
+    Single pass over the structural characters only; braces inside JSON strings are ignored.
+    An object that never closes (e.g. a truncated response) is not yielded
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped_until = -1
+
+    for match in JSON_STRUCTURE_PATTERN.finditer(text, pos):
+        position = match.start()
+        if position < escaped_until:
+            continue
+
+        char = match.group()
+        if in_string:
+            if char == '\\':
+                escaped_until = position + 2
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0  # Quotes in surrounding prose are not JSON strings
+        elif char == '{':
+            if depth == 0:
+                start = position
+            depth += 1
+        elif char == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start:position + 1]
+
+
+def response_hit_token_limit(response: Any) -> bool:
+    """True when Gemini stopped generating because it ran out of output tokens"""
+    candidates = getattr(response, "candidates", None) or []
+    finish_reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    return getattr(finish_reason, "name", finish_reason) == "MAX_TOKENS"
+
+
+def find_json_object(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, or None if there isn't one"""
+    return next(iter_json_objects(text), None)
+
+
+def empty_resume_analysis(name: str, candidate_summary: str) -> Dict[str, Any]:
+    """
+    Resume analysis skeleton used when the AI result can't be produced or parsed
+    Built as a literal on each call - measurably cheaper than deep-copying a shared template
+    """
+    return {
+        "contact_info": {
+            "name": name,
+            "email": None,
+            "phone": None,
+            "linkedin": None,
+            "location": None
+        },
+        "skills_by_category": {
+            "programming_languages": [],
+            "web_frameworks": [],
+            "databases": [],
+            "cloud_platforms": [],
+            "devops_tools": [],
+            "frontend_tools": [],
+            "testing_tools": [],
+            "version_control": [],
+            "soft_skills": []
+        },
+        "work_history": [],
+        "education": {
+            "degrees": [],
+            "certifications": []
+        },
+        "projects": [],
+        "experience_analysis": {
+            "total_years": 0,
+            "relevant_years": 0,
+            "current_level": "unknown"
+        },
+        "candidate_summary": candidate_summary,
+        "resume_quality": {
+            "overall_quality": 30,
+            "formatting_score": 30,
+            "completeness_score": 30
+        },
+        "leadership_indicators": {
+            "has_leadership_experience": False,
+            "team_sizes_managed": [],
+            "leadership_skills": []
+        },
+        "career_insights": {
+            "specializations": [],
+            "career_trajectory": "unknown",
+            "job_stability": "unknown"
+        }
+    }
+
+# The literal word a regex source starts with (every experience quality pattern has one)
+PATTERN_LEADING_LITERAL = re.compile(r'[a-z\-]+')
+
+# Characters stripped from skill names that have no synonym entry
+SKILL_NOISE_PATTERN = re.compile(r'[^\w\s\-\.\+#]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@lru_cache(maxsize=8192)
+def clean_skill_name(skill_lower: str) -> str:
+    """Strip noise characters and collapse whitespace in a lowercased skill name"""
+    skill_clean = SKILL_NOISE_PATTERN.sub('', skill_lower)
+    return WHITESPACE_PATTERN.sub(' ', skill_clean).strip()
+
+# Technology stacks that earn a relationship bonus: (member skills, multiplier)
+TECH_STACK_BONUSES = {
+    "mern_stack": (frozenset({"mongodb", "express", "react", "javascript"}), 1.2),
+    "mean_stack": (frozenset({"mongodb", "express", "angular", "javascript"}), 1.2),
+    "django_python": (frozenset({"python", "django", "postgresql"}), 1.15),
+    "spring_java": (frozenset({"java", "spring", "mysql"}), 1.15),
+    "react_ecosystem": (frozenset({"react", "redux", "webpack", "jest"}), 1.1),
+    "aws_cloud": (frozenset({"aws", "docker", "terraform", "kubernetes"}), 1.2),
+    "data_science": (frozenset({"python", "pandas", "numpy", "tensorflow"}), 1.25),
+}
+
+# Substrings used to spot job requirements filed under the wrong skill category
+JOB_LANGUAGE_MARKERS = ("python", "javascript", "java", "c#", "go", "rust", "php", "ruby", "swift", "kotlin")
+JOB_FRAMEWORK_MARKERS = ("react", "angular", "vue", "django", "flask", "express", "spring", "laravel", "fastapi")
+JOB_DATABASE_MARKERS = ("mysql", "postgresql", "mongodb", "redis", "sqlite", "dynamodb", "oracle", "sql")
+
+# Same idea for resume skills (the resume validator never used the database list)
+RESUME_LANGUAGE_MARKERS = ("python", "javascript", "java", "c#", "go", "rust", "php", "ruby", "swift", "kotlin")
+RESUME_FRAMEWORK_MARKERS = ("react", "angular", "vue", "django", "flask", "express", "spring", "laravel")
+
+
+def compile_marker_pattern(markers: Tuple[str, ...]) -> re.Pattern:
+    """One alternation regex whose search() matches any(marker in text)"""
+    return re.compile('|'.join(re.escape(marker) for marker in markers))
+
+
+JOB_LANGUAGE_PATTERN = compile_marker_pattern(JOB_LANGUAGE_MARKERS)
+JOB_FRAMEWORK_PATTERN = compile_marker_pattern(JOB_FRAMEWORK_MARKERS)
+JOB_DATABASE_PATTERN = compile_marker_pattern(JOB_DATABASE_MARKERS)
+RESUME_LANGUAGE_PATTERN = compile_marker_pattern(RESUME_LANGUAGE_MARKERS)
+RESUME_FRAMEWORK_PATTERN = compile_marker_pattern(RESUME_FRAMEWORK_MARKERS)
+
+# Resume category -> (pattern for skills that don't belong there, category they belong in)
+RESUME_CATEGORY_FIXES = {
+    "programming_languages": (RESUME_FRAMEWORK_PATTERN, "web_frameworks"),
+    "web_frameworks": (RESUME_LANGUAGE_PATTERN, "programming_languages"),
+}
+
+# Job category -> ordered (pattern, category it belongs in) checks for misplaced requirements
+JOB_CATEGORY_FIXES = {
+    "programming_languages": (
+        (JOB_FRAMEWORK_PATTERN, "web_frameworks"),
+        (JOB_DATABASE_PATTERN, "databases"),
+    ),
+    "web_frameworks": (
+        (JOB_LANGUAGE_PATTERN, "programming_languages"),
+    ),
+}
+
+# Databases close enough that experience with one partially covers the other
+RELATED_DATABASES = {
+    "mysql": ("postgresql", "sqlite", "mariadb"),
+    "postgresql": ("mysql", "sqlite"),
+    "mongodb": ("dynamodb", "couchdb"),
+}
+
+# Seniority implied by a minimum-experience requirement: up to 2 years junior, 5 mid, 10 senior, then lead
+SENIORITY_MAX_YEARS = (2, 5, 10)
+SENIORITY_LEVELS = ("junior", "mid", "senior", "lead")
+
+# 🎯 Balanced per-role category weights that don't over-penalize certain roles
+BALANCED_ROLE_WEIGHTS = {
+    "fullstack_developer": {
+        "programming_languages": 0.25,    # Balanced across stack
+        "web_frameworks": 0.25,           # Critical for both FE & BE
+        "databases": 0.15,                # Data layer important
+        "frontend_tools": 0.10,           # UI skills matter
+        "cloud_platforms": 0.10,          # Deployment knowledge
+        "devops_tools": 0.08,            # CI/CD awareness
+        "testing_tools": 0.05,           # Quality assurance
+        "version_control": 0.02           # Basic requirement
+    },
+    
+    "backend_developer": {
+        "programming_languages": 0.35,    # Core backend languages
+        "web_frameworks": 0.25,           # API frameworks crucial
+        "databases": 0.25,                # Data handling critical
+        "cloud_platforms": 0.08,          # Deployment knowledge
+        "devops_tools": 0.05,            # CI/CD awareness
+        "testing_tools": 0.02            # Unit testing
+    },
+    
+    "frontend_developer": {
+        "web_frameworks": 0.35,           # React/Angular focus
+        "programming_languages": 0.25,    # JS/TS critical
+        "frontend_tools": 0.25,           # CSS/HTML/Webpack
+        "databases": 0.05,                # Less critical
+        "cloud_platforms": 0.05,          # Deployment basics
+        "devops_tools": 0.03,            # Nice to have
+        "testing_tools": 0.02            # Frontend testing
+    },
+    
+    "devops_engineer": {
+        "devops_tools": 0.40,            # Core focus
+        "cloud_platforms": 0.35,         # Infrastructure critical
+        "programming_languages": 0.15,   # Scripting languages
+        "databases": 0.05,               # DB administration
+        "web_frameworks": 0.03,          # App understanding
+        "testing_tools": 0.02            # Testing pipelines
+    },
+    
+    "data_scientist": {
+        "data_tools": 0.45,              # ML/DS tools critical
+        "programming_languages": 0.25,   # Python/R focus
+        "databases": 0.20,               # Data querying
+        "cloud_platforms": 0.07,         # Cloud ML services
+        "web_frameworks": 0.02,          # Dashboards/APIs
+        "testing_tools": 0.01
+    },
+    
+    "mobile_developer": {
+        "mobile_development": 0.45,      # iOS/Android/RN
+        "programming_languages": 0.30,   # Swift/Kotlin/Java
+        "databases": 0.10,               # Mobile data storage
+        "cloud_platforms": 0.10,         # Backend services
+        "web_frameworks": 0.03,          # Hybrid development
+        "testing_tools": 0.02            # Mobile testing
+    }
+}
+
+# Title words signalling career progression, most senior-sounding credit first
+PROGRESSION_INDICATORS = ("senior", "lead", "principal", "architect", "manager", "director")
+
+# Credit given for a matched skill at each proficiency level
+PROFICIENCY_MULTIPLIERS = {
+    "expert": 1.0,
+    "advanced": 0.9,
+    "intermediate": 0.8,
+    "beginner": 0.6
+}
+
 class AIAnalyzer:
     """
     🌟 ENTERPRISE-GRADE AI ANALYZER 🌟
@@ -87,6 +378,13 @@ class AIAnalyzer:
             "spark": ["spark", "apache spark", "big data"],
         }
         
+        # Flat synonym -> canonical index for O(1) normalization; the first canonical
+        # skill listing a synonym wins, matching the old in-order scan
+        self._skill_synonym_index = {}
+        for canonical_skill, synonyms in self.skill_synonyms.items():
+            for synonym in synonyms:
+                self._skill_synonym_index.setdefault(synonym, canonical_skill)
+        
         # 🌟 ENHANCEMENT 2: ROLE-SPECIFIC SCORING WEIGHTS
         self.role_weights = {
             "frontend_developer": {
@@ -201,129 +499,167 @@ class AIAnalyzer:
             ]
         }
         
+        # Compiled once here since the indicator scan runs for every resume. Each pattern is
+        # paired with the literal word it starts with, so a plain substring test can skip it,
+        # and a flag for patterns that are nothing but that word (counted with str.count).
+        # The scan text is lowercased, so ASCII text can use a case-sensitive compile - much
+        # faster than IGNORECASE, which is kept for text with non-ASCII case folds
+        self._experience_quality_regexes = {
+            category: [
+                (
+                    PATTERN_LEADING_LITERAL.match(pattern).group(),
+                    PATTERN_LEADING_LITERAL.fullmatch(pattern) is not None,
+                    re.compile(pattern),
+                    re.compile(pattern, re.IGNORECASE)
+                )
+                for pattern in patterns
+            ]
+            for category, patterns in self.experience_quality_patterns.items()
+        }
+        
+        # 🎯 ROLE DETECTION KEYWORDS (scanned against job text on every role detection)
+        self.role_tech_keywords = {
+            "frontend": (
+                "react", "angular", "vue", "javascript", "typescript", "jsx", "tsx",
+                "html", "css", "scss", "sass", "bootstrap", "material-ui", "angular material",
+                "frontend", "front-end", "ui", "user interface", "responsive design"
+            ),
+            "backend": (
+                "python", "django", "flask", "fastapi", "java", "spring", "spring boot",
+                "node.js", "nodejs", "express", "api", "rest", "restful", "graphql",
+                "backend", "back-end", "server-side", "microservices", "django rest framework",
+                "rest framework", "php", "laravel", "ruby", "rails", "go", "golang", ".net", "c#"
+            ),
+            "devops": (
+                "docker", "kubernetes", "k8s", "jenkins", "aws", "azure", "gcp", "terraform", 
+                "ansible", "devops", "ci/cd", "infrastructure", "deployment", "containerization"
+            ),
+            "data": (
+                "python", "pandas", "numpy", "tensorflow", "pytorch", "scikit-learn", "machine learning",
+                "data science", "ml", "ai", "artificial intelligence", "jupyter", "spark"
+            )
+        }
+        
+        self.fullstack_indicators = (
+            "full stack", "fullstack", "full-stack", "end-to-end", "end to end",
+            "frontend and backend", "backend and frontend", "front-end and back-end"
+        )
+        
+        # 🗄️ Parsed Gemini results, keyed by a hash of everything that shapes the prompt
+        self._analysis_cache = AnalysisCache(
+            maxsize=settings.analysis_cache_size,
+            ttl_seconds=settings.analysis_cache_ttl_seconds
+        )
+        
+        # Role detection depends only on the job text and the tables above
+        self._classify_role_cached = lru_cache(maxsize=256)(self._classify_role)
+        
         # Initialize Google Gemini client
         if settings.google_api_key:
             try:
                 genai.configure(api_key=settings.google_api_key)
-                self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+                # Same settings for every call, so the config is built once and owned by the model
+                self.model = genai.GenerativeModel(
+                    'gemini-2.0-flash-exp',
+                    generation_config=genai.types.GenerationConfig(
+                        max_output_tokens=8000,
+                        temperature=0.15,  # Optimized for structured extraction accuracy
+                        candidate_count=1,
+                        top_p=0.85,       # Balanced for consistent structured outputs
+                        top_k=40          # Reduced for more deterministic responses
+                    )
+                )
                 logger.info("✅ Advanced AI Analyzer initialized with enterprise features")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Google Gemini: {e}")
         else:
             logger.warning("⚠️ No Google API key found - check your .env file")
     
+    def _find_tech_mentions(self, category: str, text: str) -> Tuple[int, List[str]]:
+        """Return (count, matches) of role keywords from one category present in text"""
+        
+        # Presence only: one substring test per keyword, which CPython's fast search
+        # handles faster than a combined regex alternation over the same text
+        matches = [tech for tech in self.role_tech_keywords[category] if tech in text]
+        return len(matches), matches
+    
     def _detect_role_type_fixed(self, job_title: str, job_description: str, required_skills: dict = None) -> str:
         """
         🎯 IMPROVED: More accurate role detection with better text analysis
         """
         
-        if not job_title:
-            job_title = ""
+        # The same job text is classified repeatedly across analysis passes and requests
+        return self._classify_role_cached(job_title or "", job_description)
+    
+    def _classify_role(self, job_title: str, job_description: str) -> str:
+        """Classify a job into a role type from its title and description text"""
         
         combined_text = f"{job_title} {job_description}".lower()
-        logger.info(f"🔍 Analyzing role for: '{job_title}' (text length: {len(combined_text)})")
-        
-        # 🌟 IMPROVEMENT 1: Enhanced technology detection with more comprehensive lists
-        frontend_techs = [
-            "react", "angular", "vue", "javascript", "typescript", "jsx", "tsx",
-            "html", "css", "scss", "sass", "bootstrap", "material-ui", "angular material",
-            "frontend", "front-end", "ui", "user interface", "responsive design"
-        ]
-        
-        backend_techs = [
-            "python", "django", "flask", "fastapi", "java", "spring", "spring boot",
-            "node.js", "nodejs", "express", "api", "rest", "restful", "graphql",
-            "backend", "back-end", "server-side", "microservices", "django rest framework",
-            "rest framework", "php", "laravel", "ruby", "rails", "go", "golang", ".net", "c#"
-        ]
-        
-        fullstack_indicators = [
-            "full stack", "fullstack", "full-stack", "end-to-end", "end to end",
-            "frontend and backend", "backend and frontend", "front-end and back-end"
-        ]
-        
-        devops_techs = [
-            "docker", "kubernetes", "k8s", "jenkins", "aws", "azure", "gcp", "terraform", 
-            "ansible", "devops", "ci/cd", "infrastructure", "deployment", "containerization"
-        ]
-        
-        data_techs = [
-            "python", "pandas", "numpy", "tensorflow", "pytorch", "scikit-learn", "machine learning",
-            "data science", "ml", "ai", "artificial intelligence", "jupyter", "spark"
-        ]
-        
-        # 🌟 IMPROVEMENT 2: Better counting with partial matches
-        def count_tech_mentions(tech_list, text):
-            count = 0
-            matches = []
-            for tech in tech_list:
-                if tech in text:
-                    count += 1
-                    matches.append(tech)
-            return count, matches
-        
-        frontend_count, frontend_matches = count_tech_mentions(frontend_techs, combined_text)
-        backend_count, backend_matches = count_tech_mentions(backend_techs, combined_text)
-        devops_count, devops_matches = count_tech_mentions(devops_techs, combined_text)
-        data_count, data_matches = count_tech_mentions(data_techs, combined_text)
+        logger.info("🔍 Analyzing role for: '%s' (text length: %s)", job_title, len(combined_text))
+        
+        # 🌟 IMPROVEMENT 1: Enhanced technology detection (keyword tables built once in __init__)
+        frontend_count, frontend_matches = self._find_tech_mentions("frontend", combined_text)
+        backend_count, backend_matches = self._find_tech_mentions("backend", combined_text)
+        devops_count, devops_matches = self._find_tech_mentions("devops", combined_text)
+        data_count, data_matches = self._find_tech_mentions("data", combined_text)
         
         # Check for explicit fullstack indicators
-        fullstack_explicit = any(indicator in combined_text for indicator in fullstack_indicators)
+        fullstack_explicit = any(indicator in combined_text for indicator in self.fullstack_indicators)
         
-        logger.info(f"🔢 Tech analysis:")
-        logger.info(f"   Frontend: {frontend_count} matches {frontend_matches[:3]}")
-        logger.info(f"   Backend: {backend_count} matches {backend_matches[:3]}")
-        logger.info(f"   DevOps: {devops_count} matches {devops_matches[:3]}")
-        logger.info(f"   Data: {data_count} matches {data_matches[:3]}")
-        logger.info(f"   Fullstack explicit: {fullstack_explicit}")
+        logger.info("🔢 Tech analysis:")
+        logger.info("   Frontend: %s matches %s", frontend_count, frontend_matches[:3])
+        logger.info("   Backend: %s matches %s", backend_count, backend_matches[:3])
+        logger.info("   DevOps: %s matches %s", devops_count, devops_matches[:3])
+        logger.info("   Data: %s matches %s", data_count, data_matches[:3])
+        logger.info("   Fullstack explicit: %s", fullstack_explicit)
         
         # 🌟 IMPROVEMENT 3: More intelligent decision logic
         
         # Explicit fullstack indicators trump everything
         if fullstack_explicit:
-            logger.info(f"🏆 FULLSTACK: Explicit fullstack indicators found")
+            logger.info("🏆 FULLSTACK: Explicit fullstack indicators found")
             return "fullstack_developer"
         
         # Strong fullstack profile (good in both frontend and backend)
         if frontend_count >= 3 and backend_count >= 3:
-            logger.info(f"🏆 FULLSTACK: Strong in both stacks (FE:{frontend_count}, BE:{backend_count})")
+            logger.info("🏆 FULLSTACK: Strong in both stacks (FE:%s, BE:%s)", frontend_count, backend_count)
             return "fullstack_developer"
         
         # Moderate fullstack profile 
         if frontend_count >= 2 and backend_count >= 2:
-            logger.info(f"🏆 FULLSTACK: Moderate fullstack profile (FE:{frontend_count}, BE:{backend_count})")
+            logger.info("🏆 FULLSTACK: Moderate fullstack profile (FE:%s, BE:%s)", frontend_count, backend_count)
             return "fullstack_developer"
         
         # Data science specialization
         if data_count >= 4:
-            logger.info(f"🏆 DATA_SCIENTIST: Strong data science focus ({data_count} matches)")
+            logger.info("🏆 DATA_SCIENTIST: Strong data science focus (%s matches)", data_count)
             return "data_scientist"
         
         # DevOps specialization (but not if strong programming background)
         if devops_count >= 4 and (frontend_count + backend_count) < 4:
-            logger.info(f"🏆 DEVOPS: Strong DevOps focus ({devops_count} matches)")
+            logger.info("🏆 DEVOPS: Strong DevOps focus (%s matches)", devops_count)
             return "devops_engineer"
         
         # Backend specialization
         if backend_count >= 4 and frontend_count < 2:
-            logger.info(f"🏆 BACKEND: Strong backend focus ({backend_count} matches)")
+            logger.info("🏆 BACKEND: Strong backend focus (%s matches)", backend_count)
             return "backend_developer"
         
         # Frontend specialization  
         if frontend_count >= 4 and backend_count < 2:
-            logger.info(f"🏆 FRONTEND: Strong frontend focus ({frontend_count} matches)")
+            logger.info("🏆 FRONTEND: Strong frontend focus (%s matches)", frontend_count)
             return "frontend_developer"
         
         # Default logic based on highest count
         if backend_count > frontend_count:
-            logger.info(f"🏆 BACKEND: Backend dominant ({backend_count} vs {frontend_count})")
+            logger.info("🏆 BACKEND: Backend dominant (%s vs %s)", backend_count, frontend_count)
             return "backend_developer"
         elif frontend_count > backend_count:
-            logger.info(f"🏆 FRONTEND: Frontend dominant ({frontend_count} vs {backend_count})")
+            logger.info("🏆 FRONTEND: Frontend dominant (%s vs %s)", frontend_count, backend_count)
             return "frontend_developer"
         else:
             # Equal or both low - default to backend for most developer positions
-            logger.info(f"🏆 DEFAULT: Equal counts, defaulting to backend")
+            logger.info("🏆 DEFAULT: Equal counts, defaulting to backend")
             return "backend_developer"
 
 
@@ -333,71 +669,14 @@ class AIAnalyzer:
         🎯 FIXED: Balanced weights that don't over-penalize certain roles
         """
         
-        weights = {
-            "fullstack_developer": {
-                "programming_languages": 0.25,    # Balanced across stack
-                "web_frameworks": 0.25,           # Critical for both FE & BE
-                "databases": 0.15,                # Data layer important
-                "frontend_tools": 0.10,           # UI skills matter
-                "cloud_platforms": 0.10,          # Deployment knowledge
-                "devops_tools": 0.08,            # CI/CD awareness
-                "testing_tools": 0.05,           # Quality assurance
-                "version_control": 0.02           # Basic requirement
-            },
-            
-            "backend_developer": {
-                "programming_languages": 0.35,    # Core backend languages
-                "web_frameworks": 0.25,           # API frameworks crucial
-                "databases": 0.25,                # Data handling critical
-                "cloud_platforms": 0.08,          # Deployment knowledge
-                "devops_tools": 0.05,            # CI/CD awareness
-                "testing_tools": 0.02            # Unit testing
-            },
-            
-            "frontend_developer": {
-                "web_frameworks": 0.35,           # React/Angular focus
-                "programming_languages": 0.25,    # JS/TS critical
-                "frontend_tools": 0.25,           # CSS/HTML/Webpack
-                "databases": 0.05,                # Less critical
-                "cloud_platforms": 0.05,          # Deployment basics
-                "devops_tools": 0.03,            # Nice to have
-                "testing_tools": 0.02            # Frontend testing
-            },
-            
-            "devops_engineer": {
-                "devops_tools": 0.40,            # Core focus
-                "cloud_platforms": 0.35,         # Infrastructure critical
-                "programming_languages": 0.15,   # Scripting languages
-                "databases": 0.05,               # DB administration
-                "web_frameworks": 0.03,          # App understanding
-                "testing_tools": 0.02            # Testing pipelines
-            },
-            
-            "data_scientist": {
-                "data_tools": 0.45,              # ML/DS tools critical
-                "programming_languages": 0.25,   # Python/R focus
-                "databases": 0.20,               # Data querying
-                "cloud_platforms": 0.07,         # Cloud ML services
-                "web_frameworks": 0.02,          # Dashboards/APIs
-                "testing_tools": 0.01
-            },
-            
-            "mobile_developer": {
-                "mobile_development": 0.45,      # iOS/Android/RN
-                "programming_languages": 0.30,   # Swift/Kotlin/Java
-                "databases": 0.10,               # Mobile data storage
-                "cloud_platforms": 0.10,         # Backend services
-                "web_frameworks": 0.03,          # Hybrid development
-                "testing_tools": 0.02            # Mobile testing
-            }
-        }
-        
-        return weights.get(detected_role, weights["backend_developer"])  # Safe fallback
+        # Copy so callers can adjust their weights without touching the shared table
+        return dict(BALANCED_ROLE_WEIGHTS.get(detected_role, BALANCED_ROLE_WEIGHTS["backend_developer"]))  # Safe fallback
 
 
-    def _create_skill_synonym_database(self) -> dict:
+    @cached_property
+    def _skill_synonym_db(self) -> dict:
         """
-        🧠 Enhanced skill synonym database
+        🧠 Enhanced skill synonym database (built on first access, then reused)
         """
         return {
             # Database synonyms
@@ -433,6 +712,16 @@ class AIAnalyzer:
             }
         }
 
+    @cached_property
+    def _skill_variation_index(self) -> Dict[str, str]:
+        """Flattened variation -> canonical skill view of the synonym database"""
+        return {
+            variation: canonical_skill
+            for skill_groups in self._skill_synonym_db.values()
+            for canonical_skill, variations in skill_groups.items()
+            for variation in variations
+        }
+
 
     def _calculate_skill_match_with_synonyms(self, candidate_skill: str, required_skill: str) -> tuple:
         """
@@ -446,25 +735,17 @@ class AIAnalyzer:
         if candidate_lower == required_lower:
             return (1.0, "exact")
         
-        # 2. Synonym match
-        synonyms = self._create_skill_synonym_database()
-        for category, skill_groups in synonyms.items():
-            for canonical_skill, variations in skill_groups.items():
-                if required_lower in variations and candidate_lower in variations:
-                    return (0.95, "synonym")
+        # 2. Synonym match - both names are variations of the same canonical skill
+        required_canonical = self._skill_variation_index.get(required_lower)
+        if required_canonical is not None and required_canonical == self._skill_variation_index.get(candidate_lower):
+            return (0.95, "synonym")
         
         # 3. Partial match (contains)
         if required_lower in candidate_lower or candidate_lower in required_lower:
             return (0.8, "partial")
         
         # 4. Related technologies (e.g., MySQL → PostgreSQL)
-        database_relations = {
-            "mysql": ["postgresql", "sqlite", "mariadb"],
-            "postgresql": ["mysql", "sqlite"],
-            "mongodb": ["dynamodb", "couchdb"],
-        }
-        
-        for base_skill, related_skills in database_relations.items():
+        for base_skill, related_skills in RELATED_DATABASES.items():
             if base_skill in required_lower and any(rel in candidate_lower for rel in related_skills):
                 return (0.75, "related")
             if base_skill in candidate_lower and any(rel in required_lower for rel in related_skills):
@@ -476,38 +757,36 @@ class AIAnalyzer:
     def _normalize_skill(self, skill: str) -> str:
         """🧠 Enhanced skill normalization with synonym mapping"""
         
-        skill_lower = skill.lower().strip()
-        
-        # Check against our synonym database
-        for canonical_skill, synonyms in self.skill_synonyms.items():
-            if skill_lower in synonyms:
-                return canonical_skill
+        return self._normalize_skills([skill])[0]
+    
+    def _normalize_skills(self, skills: List[str]) -> List[str]:
+        """Normalize a batch of skill names in one pass over the synonym index"""
         
-        # Fallback: clean and standardize
-        skill_clean = re.sub(r'[^\w\s\-\.\+#]', '', skill_lower)
-        skill_clean = re.sub(r'\s+', ' ', skill_clean).strip()
+        synonym_lookup = self._skill_synonym_index.get
+        normalized = []
+        for skill in skills:
+            skill_lower = skill.lower().strip()
+            
+            # Check against our synonym database
+            canonical_skill = synonym_lookup(skill_lower)
+            if canonical_skill:
+                normalized.append(canonical_skill)
+                continue
+            
+            # Fallback: clean and standardize (memoized - the same names recur across resumes)
+            normalized.append(clean_skill_name(skill_lower))
         
-        return skill_clean
+        return normalized
     
-    def _calculate_skill_relationships(self, candidate_skills: List[str]) -> Dict[str, float]:
+    def _calculate_skill_relationships(self, candidate_skills: Iterable[str]) -> Dict[str, float]:
         """🔗 Calculate skill relationship bonuses"""
         
         bonuses = {}
-        normalized_skills = [self._normalize_skill(skill) for skill in candidate_skills]
+        normalized_skills = set(self._normalize_skills(candidate_skills))
         
         # Technology stack bonuses
-        tech_stacks = {
-            "mern_stack": (["mongodb", "express", "react", "javascript"], 1.2),
-            "mean_stack": (["mongodb", "express", "angular", "javascript"], 1.2),
-            "django_python": (["python", "django", "postgresql"], 1.15),
-            "spring_java": (["java", "spring", "mysql"], 1.15),
-            "react_ecosystem": (["react", "redux", "webpack", "jest"], 1.1),
-            "aws_cloud": (["aws", "docker", "terraform", "kubernetes"], 1.2),
-            "data_science": (["python", "pandas", "numpy", "tensorflow"], 1.25),
-        }
-        
-        for stack_name, (required_skills, multiplier) in tech_stacks.items():
-            matches = sum(1 for req_skill in required_skills if req_skill in normalized_skills)
+        for stack_name, (required_skills, multiplier) in TECH_STACK_BONUSES.items():
+            matches = len(required_skills & normalized_skills)
             if matches >= len(required_skills) * 0.75:  # 75% of stack present
                 bonus_strength = (matches / len(required_skills)) * (multiplier - 1.0)
                 bonuses[stack_name] = bonus_strength
@@ -517,6 +796,32 @@ class AIAnalyzer:
     def _analyze_experience_quality(self, work_history: List[Dict], resume_text: str) -> Dict[str, Any]:
         """⭐ Advanced experience quality analysis"""
         
+        quality_metrics = self._scan_experience_indicators(resume_text)
+        return self._apply_career_progression(quality_metrics, work_history)
+    
+    def _find_quality_matches(self, category: str, text_lower: str):
+        """
+        Yield findall() results for each pattern in a quality category
+        Patterns whose leading word isn't in the text are skipped without running the regex,
+        and bare-word patterns are counted directly. ASCII text only - IGNORECASE also folds
+        a few non-ASCII letters (like 'ſ' onto 's') that a substring test would miss, so other
+        text goes through the case-folding regexes unfiltered
+        """
+        is_ascii = text_lower.isascii()
+        for literal, is_plain_word, ascii_pattern, folding_pattern in self._experience_quality_regexes[category]:
+            if not is_ascii:
+                yield folding_pattern.findall(text_lower)
+            elif literal not in text_lower:
+                continue
+            elif is_plain_word:
+                # Same non-overlapping occurrences findall() would return
+                yield [literal] * text_lower.count(literal)
+            else:
+                yield ascii_pattern.findall(text_lower)
+    
+    def _scan_experience_indicators(self, resume_text: str) -> Dict[str, Any]:
+        """Score leadership/impact/innovation/collaboration from the raw resume text only"""
+        
         quality_metrics = {
             "leadership_score": 0,
             "impact_score": 0,
@@ -531,8 +836,7 @@ class AIAnalyzer:
         text_to_analyze = resume_text.lower()
         
         # 1. Leadership Analysis
-        for pattern in self.experience_quality_patterns["leadership_indicators"]:
-            matches = re.findall(pattern, text_to_analyze, re.IGNORECASE)
+        for matches in self._find_quality_matches("leadership_indicators", text_to_analyze):
             for match in matches:
                 if isinstance(match, str) and match.isdigit():
                     team_size = int(match)
@@ -543,8 +847,7 @@ class AIAnalyzer:
                     quality_metrics["leadership_evidence"].append(match)
         
         # 2. Impact Analysis
-        for pattern in self.experience_quality_patterns["impact_indicators"]:
-            matches = re.findall(pattern, text_to_analyze, re.IGNORECASE)
+        for matches in self._find_quality_matches("impact_indicators", text_to_analyze):
             for match in matches:
                 if isinstance(match, str):
                     quality_metrics["impact_score"] += 20
@@ -552,30 +855,32 @@ class AIAnalyzer:
                     quality_metrics["impact_evidence"].append(f"Quantified impact: {match}")
         
         # 3. Innovation Analysis
-        innovation_count = 0
-        for pattern in self.experience_quality_patterns["innovation_indicators"]:
-            matches = len(re.findall(pattern, text_to_analyze, re.IGNORECASE))
-            innovation_count += matches
+        innovation_count = sum(
+            len(matches) for matches in self._find_quality_matches("innovation_indicators", text_to_analyze)
+        )
         quality_metrics["innovation_score"] = min(innovation_count * 15, 75)
         
         # 4. Collaboration Analysis
-        collaboration_count = 0
-        for pattern in self.experience_quality_patterns["collaboration_indicators"]:
-            matches = len(re.findall(pattern, text_to_analyze, re.IGNORECASE))
-            collaboration_count += matches
+        collaboration_count = sum(
+            len(matches) for matches in self._find_quality_matches("collaboration_indicators", text_to_analyze)
+        )
         quality_metrics["collaboration_score"] = min(collaboration_count * 10, 50)
         
+        return quality_metrics
+    
+    def _apply_career_progression(self, quality_metrics: Dict[str, Any], work_history: List[Dict]) -> Dict[str, Any]:
+        """Add the work-history based progression score and the overall quality score"""
+        
         # 5. Career Progression Analysis
         if work_history and len(work_history) > 1:
-            progression_indicators = ["senior", "lead", "principal", "architect", "manager", "director"]
-            
-            # Sort by most recent (assuming work_history is chronological)
-            recent_roles = [job.get("title", "").lower() for job in work_history[:3]]
+            # Sort by most recent (assuming work_history is chronological). One newline-joined
+            # string means one substring test per indicator - no indicator can span two titles
+            recent_roles = "\n".join(job.get("title", "").lower() for job in work_history[:3])
             
             progression_score = 0
-            for i, indicator in enumerate(progression_indicators):
-                if any(indicator in role for role in recent_roles):
-                    progression_score = (len(progression_indicators) - i) * 10
+            for i, indicator in enumerate(PROGRESSION_INDICATORS):
+                if indicator in recent_roles:
+                    progression_score = (len(PROGRESSION_INDICATORS) - i) * 10
                     break
             
             quality_metrics["progression_score"] = progression_score
@@ -596,46 +901,52 @@ class AIAnalyzer:
     async def enhanced_resume_analysis(self, resume_text: str, job_analysis: Optional[Dict] = None) -> Dict[str, Any]:
         """🚀 ENHANCED resume analysis with all three improvements"""
         
-        # Get basic analysis first
-        basic_analysis = await self.analyze_resume_content(resume_text, job_analysis)
+        # The indicator scan only reads resume_text, so run it in a worker thread
+        # while the Gemini request is in flight
+        basic_analysis, quality_metrics = await asyncio.gather(
+            self.analyze_resume_content(resume_text, job_analysis),
+            asyncio.to_thread(self._scan_experience_indicators, resume_text)
+        )
         
         # 🌟 ENHANCEMENT 1: Apply skill intelligence
         enhanced_skills = {}
+        pending_skills = []  # skill dicts awaiting a normalized_name, in category order
         if "skills_by_category" in basic_analysis:
             for category, skills in basic_analysis["skills_by_category"].items():
                 if isinstance(skills, list):
                     normalized_skills = []
                     for skill_item in skills:
                         if isinstance(skill_item, dict) and "name" in skill_item:
-                            normalized_name = self._normalize_skill(skill_item["name"])
-                            skill_item["normalized_name"] = normalized_name
                             normalized_skills.append(skill_item)
                         elif isinstance(skill_item, str):
-                            normalized_skills.append({
+                            skill_item = {
                                 "name": skill_item,
-                                "normalized_name": self._normalize_skill(skill_item),
+                                "normalized_name": None,
                                 "proficiency": "intermediate"
-                            })
+                            }
+                            normalized_skills.append(skill_item)
+                        else:
+                            continue
+                        pending_skills.append(skill_item)
                     enhanced_skills[category] = normalized_skills
                 else:
                     enhanced_skills[category] = skills
         
-        # Calculate skill relationship bonuses
-        all_skills = []
-        for category_skills in enhanced_skills.values():
-            if isinstance(category_skills, list):
-                all_skills.extend([s.get("normalized_name", s.get("name", "")) 
-                                if isinstance(s, dict) else s for s in category_skills])
+        # Normalize every collected skill in one batch and scatter the names back
+        all_skills = self._normalize_skills([skill_item["name"] for skill_item in pending_skills])
+        for skill_item, normalized_name in zip(pending_skills, all_skills):
+            skill_item["normalized_name"] = normalized_name
         
-        skill_bonuses = self._calculate_skill_relationships(all_skills)
+        # Calculate skill relationship bonuses - only the distinct names matter, and the
+        # same skill is often listed under several categories
+        skill_bonuses = self._calculate_skill_relationships(set(all_skills))
         
         # 🌟 ENHANCEMENT 3: Analyze experience quality
         work_history = basic_analysis.get("work_history", [])
-        experience_quality = self._analyze_experience_quality(work_history, resume_text)
+        experience_quality = self._apply_career_progression(quality_metrics, work_history)
         
-        # Combine all enhancements
-        enhanced_analysis = {
-            **basic_analysis,
+        # Combine all enhancements in place - basic_analysis is a fresh result we own
+        basic_analysis.update({
             "enhanced_skills": enhanced_skills,
             "skill_relationship_bonuses": skill_bonuses,
             "experience_quality_analysis": experience_quality,
@@ -644,9 +955,9 @@ class AIAnalyzer:
                 "experience_quality": True,
                 "relationship_bonuses": len(skill_bonuses) > 0
             }
-        }
+        })
         
-        return enhanced_analysis
+        return basic_analysis
     
     async def enhanced_job_analysis(self, job_description: str, job_title: str = None) -> Dict[str, Any]:
         """🎯 Enhanced job analysis with role detection"""
@@ -658,18 +969,17 @@ class AIAnalyzer:
         detected_role = self._detect_role_type_fixed(job_title or "", job_description)
         role_weights = self.role_weights.get(detected_role, self.role_weights["default"])
         
-        # Add enhanced information
-        enhanced_analysis = {
-            **basic_analysis,
+        # Add enhanced information (basic_analysis is ours - analysis results are never shared)
+        basic_analysis.update({
             "detected_role_type": detected_role,
             "role_specific_weights": role_weights,
             "enhancement_features": {
                 "role_detection": True,
                 "adaptive_weighting": True
             }
-        }
+        })
         
-        return enhanced_analysis
+        return basic_analysis
     
     async def calculate_enhanced_score(self, resume_analysis: Dict, job_analysis: Dict) -> Dict[str, Any]:
         """🎯 Calculate final score using all enhancements"""
@@ -681,6 +991,11 @@ class AIAnalyzer:
         enhanced_skills = resume_analysis.get("enhanced_skills", {})
         required_skills = job_analysis.get("required_skills", {})
         
+        # Relationship bonuses are per resume, so fold them into one multiplier up front
+        bonus_multiplier = self._relationship_bonus_multiplier(
+            resume_analysis.get("skill_relationship_bonuses", {})
+        )
+        
         skill_scores = {}
         total_weighted_score = 0
         total_weight = 0
@@ -690,7 +1005,7 @@ class AIAnalyzer:
                 category_score = self._calculate_enhanced_category_score(
                     enhanced_skills.get(category, []),
                     required_skills.get(category, []),
-                    resume_analysis.get("skill_relationship_bonuses", {})
+                    bonus_multiplier
                 )
                 skill_scores[category] = category_score
                 total_weighted_score += category_score * weight
@@ -717,12 +1032,24 @@ class AIAnalyzer:
             ]
         }
     
-    def _calculate_enhanced_category_score(self, candidate_skills: List, required_skills: List, bonuses: Dict) -> float:
+    def _relationship_bonus_multiplier(self, bonuses: Dict) -> float:
+        """Turn skill relationship bonuses into a score multiplier"""
+        
+        bonus_multiplier = 1.0
+        for bonus_name, bonus_value in bonuses.items():
+            bonus_multiplier += bonus_value * 0.5  # Scale down bonus impact
+        
+        return bonus_multiplier
+    
+    def _calculate_enhanced_category_score(self, candidate_skills: List, required_skills: List, bonus_multiplier: float) -> float:
         """Calculate category score with skill intelligence"""
         
         if not required_skills:
             return 100  # No requirements = full score
         
+        if not candidate_skills:
+            return 0.0  # Nothing can match, whatever the bonuses
+        
         matched_skills = 0
         total_required = len(required_skills)
         
@@ -736,35 +1063,31 @@ class AIAnalyzer:
             else:
                 candidate_normalized.append((str(skill_item).lower(), "intermediate"))
         
+        # First position of each candidate skill, so an exact hit bounds the scan below
+        candidate_positions = {}
+        for position, (candidate_skill, _) in enumerate(candidate_normalized):
+            candidate_positions.setdefault(candidate_skill, position)
+        
         # Enhanced matching with synonyms
-        for required_skill in required_skills:
-            required_normalized = self._normalize_skill(required_skill)
+        for required_skill, required_normalized in zip(required_skills, self._normalize_skills(required_skills)):
+            required_lower = required_skill.lower()
             
-            # Check for matches
-            for candidate_skill, proficiency in candidate_normalized:
+            # Check for matches - the first matching candidate wins, and nothing past an
+            # exact match can come first, so only scan up to (and including) it
+            scan_end = candidate_positions.get(required_normalized, len(candidate_normalized) - 1) + 1
+            for candidate_skill, proficiency in islice(candidate_normalized, scan_end):
                 if (required_normalized == candidate_skill or 
-                    required_skill.lower() in candidate_skill or
-                    candidate_skill in required_skill.lower()):
+                    required_lower in candidate_skill or
+                    candidate_skill in required_lower):
                     
                     # Apply proficiency multiplier
-                    proficiency_multipliers = {
-                        "expert": 1.0,
-                        "advanced": 0.9,
-                        "intermediate": 0.8,
-                        "beginner": 0.6
-                    }
-                    multiplier = proficiency_multipliers.get(proficiency, 0.8)
-                    matched_skills += multiplier
+                    matched_skills += PROFICIENCY_MULTIPLIERS.get(proficiency, 0.8)
                     break
         
         # Calculate base score
         base_score = (matched_skills / total_required) * 100
         
         # Apply relationship bonuses
-        bonus_multiplier = 1.0
-        for bonus_name, bonus_value in bonuses.items():
-            bonus_multiplier += bonus_value * 0.5  # Scale down bonus impact
-        
         final_score = min(base_score * bonus_multiplier, 100)
         return final_score
     
@@ -774,16 +1097,32 @@ class AIAnalyzer:
     async def analyze_job_description(self, job_description: str, job_title: str = None, use_enhancement: bool = True) -> Dict[str, Any]:
         """Enhanced job description analysis with integrated AI enhancement"""
         
+        cache_key = make_cache_key("job_analysis", job_title, job_description, use_enhancement)
+        cached_analysis = self._analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            logger.info("⚡ Job description analysis served from cache")
+            return cached_analysis
+        
         enhanced_description = job_description
         enhancement_info = {"was_enhanced": False}
+        job_analysis = None
         
         # 🌟 INTEGRATED ENHANCEMENT LOGIC
         if use_enhancement:
+            enhancement_result = None
             try:
-                logger.info("🔧 Enhancing job description first...")
-                
-                # Call the enhancement method
-                enhancement_result = await self.enhance_job_description(job_description, job_title)
+                # One Gemini call returns both the enhancement and the analysis of it
+                logger.info("🔧 Enhancing and analyzing job description in one pass...")
+                enhancement_result, job_analysis = await self._enhance_and_analyze_job_description(job_description, job_title)
+            except Exception as e:
+                logger.warning("⚠️ Combined enhancement failed: %s, falling back to separate calls", e)
+            
+            try:
+                if enhancement_result is None:
+                    logger.info("🔧 Enhancing job description first...")
+                    
+                    # Call the enhancement method
+                    enhancement_result = await self.enhance_job_description(job_description, job_title)
                 
                 if "error" not in enhancement_result:
                     # Use enhanced description
@@ -803,202 +1142,108 @@ class AIAnalyzer:
                     logger.warning("⚠️ Enhancement failed, using original description")
                     
             except Exception as e:
-                logger.warning(f"⚠️ Enhancement failed: {e}, using original description")
-        
-        # Now analyze the (potentially enhanced) description
-        prompt = f"""
-    You are an expert HR analyst specializing in technical job requirements. Analyze this job description with HIGH PRECISION and extract detailed information. Return ONLY a valid JSON object.
-
-    ANALYSIS INSTRUCTIONS:
-    1. Read the job description completely before categorizing any skills
-    2. Distinguish carefully between REQUIRED (must-have) vs PREFERRED (nice-to-have) skills
-    3. Be precise with experience level requirements - if it says "3+ years" use 3, not 5
-    4. Categorize skills correctly (e.g., "React" = web_frameworks, "Python" = programming_languages)
-    5. Only include skills that are explicitly mentioned or clearly implied
-
-    Job Title: {job_title or 'Not specified'}
-    Job Description:
-    {enhanced_description}
-
-    SKILL CATEGORIZATION EXAMPLES:
-    - programming_languages: Python, JavaScript, Java, C#, Go, Rust, PHP, Ruby, TypeScript, Kotlin, Swift
-    - web_frameworks: React, Angular, Vue, Django, Flask, Express, Spring Boot, Laravel, FastAPI, Next.js
-    - databases: MySQL, PostgreSQL, MongoDB, Redis, DynamoDB, Cassandra, Oracle, SQL Server
-    - cloud_platforms: AWS, Azure, GCP, DigitalOcean, Heroku
-    - devops_tools: Docker, Kubernetes, Jenkins, GitLab CI, Terraform, Ansible, GitHub Actions
-    - frontend_tools: HTML, CSS, SASS, Webpack, Vite, Tailwind CSS, Bootstrap, Material-UI
-    - testing_tools: Jest, Pytest, JUnit, Selenium, Cypress, Mocha, TestNG
-
-    ⚠️ COMMON CATEGORIZATION MISTAKES TO AVOID (ANTI-PATTERNS):
-    - ❌ WRONG: Putting "React" in programming_languages → ✅ CORRECT: React belongs in web_frameworks
-    - ❌ WRONG: Putting "SQL" or "MySQL" in web_frameworks → ✅ CORRECT: SQL/MySQL belong in databases
-    - ❌ WRONG: Putting "JavaScript" in web_frameworks → ✅ CORRECT: JavaScript belongs in programming_languages
-    - ❌ WRONG: Putting "HTML/CSS" in programming_languages → ✅ CORRECT: HTML/CSS belong in frontend_tools
-    - ❌ WRONG: Putting "Django" in programming_languages → ✅ CORRECT: Django belongs in web_frameworks
-    - ❌ WRONG: Putting "Docker" in cloud_platforms → ✅ CORRECT: Docker belongs in devops_tools
-    - ❌ WRONG: Putting "Git/GitHub" in devops_tools → ✅ CORRECT: Git/GitHub belong in version_control
-    - ❌ WRONG: Categorizing soft skills like "Team Player", "Communication" as technical skills → ✅ CORRECT: Use soft_skills category
-    - ❌ WRONG: Changing "3 years experience" to "5 years" → ✅ CORRECT: Use EXACT numbers from job description
-    - ❌ WRONG: Adding skills not mentioned in the job description → ✅ CORRECT: Only extract explicitly stated skills
-
-    VALIDATION CHECKLIST (Review before returning):
-    ✓ Are all programming languages in programming_languages category?
-    ✓ Are all frameworks (React, Django, etc.) in web_frameworks category?
-    ✓ Are all databases in databases category?
-    ✓ Did I preserve the EXACT experience years from the job description?
-    ✓ Did I only include skills explicitly mentioned?
-
-    Return exactly this JSON structure:
-    {{
-        "required_skills": {{
-            "programming_languages": ["list of required programming languages"],
-            "web_frameworks": ["list of required web frameworks"],
-            "databases": ["list of required databases"],
-            "cloud_platforms": ["list of required cloud platforms"],
-            "devops_tools": ["list of required DevOps tools"],
-            "data_tools": ["list of required data science/ML tools"],
-            "frontend_tools": ["list of required frontend tools"],
-            "mobile_development": ["list of mobile development requirements"],
-            "testing_tools": ["list of testing frameworks/tools"],
-            "version_control": ["list of version control systems"],
-            "project_management": ["list of project management methodologies"],
-            "other_technical": ["other technical skills not in above categories"],
-            "soft_skills": ["communication", "leadership", "teamwork", etc.]
-        }},
-        "preferred_skills": {{
-            "programming_languages": ["nice-to-have programming languages"],
-            "web_frameworks": ["nice-to-have frameworks"],
-            "databases": ["nice-to-have databases"],
-            "cloud_platforms": ["nice-to-have cloud platforms"],
-            "devops_tools": ["nice-to-have DevOps tools"],
-            "data_tools": ["nice-to-have data tools"],
-            "other_technical": ["other nice-to-have technical skills"],
-            "soft_skills": ["nice-to-have soft skills"]
-        }},
-        "minimum_experience": number_of_years_required_or_null,
-        "preferred_experience": number_of_years_preferred_or_null,
-        "education_requirements": {{
-            "required_degree": "Bachelor's/Master's/PhD or null",
-            "preferred_degree": "Bachelor's/Master's/PhD or null",
-            "field_of_study": ["Computer Science", "Engineering", etc.],
-            "certifications": ["list of required/preferred certifications"]
-        }},
-        "key_responsibilities": ["main job duties and responsibilities"],
-        "industry": "industry or domain",
-        "seniority_level": "junior/mid/senior/lead/principal/executive",
-        "remote_work": "remote/hybrid/onsite/flexible",
-        "team_size": "size of team they'll work with or null",
-        "role_type": "individual_contributor/team_lead/manager/director",
-        "summary": "comprehensive summary of the ideal candidate profile"
-    }}
-
-    STRICT EXTRACTION RULES:
-    - Extract ONLY skills explicitly mentioned - do not infer or add related skills
-    - Categorize skills using the examples above as reference
-    - For required vs preferred: "must have", "required", "essential" = required; "nice to have", "preferred", "bonus" = preferred
-    - For experience: Use EXACT numbers stated ("3+ years" = 3, "5-7 years" = 5, "minimum 2 years" = 2)
-    - For seniority_level: Base on experience requirements and job title (0-2 years = junior, 2-5 = mid, 5-10 = senior, 10+ = lead/principal)
-    - Use null for missing information - do not guess or assume
-    - Validate your categorizations - common mistakes: React in programming_languages (should be web_frameworks), SQL in web_frameworks (should be databases)
-    - Return only the JSON, no other text or explanations
-    """
+                logger.warning("⚠️ Enhancement failed: %s, using original description", e)
         
         try:
-            if not self.model:
-                raise Exception("Google Gemini not initialized. Check your API key.")
-            
-            response = await self._call_gemini(prompt)
-            
-            try:
-                job_analysis = json.loads(response)
-
-                # 🌟 NEW: Apply validation to job analysis as well
-                validated_job_analysis = self._validate_job_analysis(job_analysis)
-
-                # Add role detection and weights
-                detected_role = self._detect_role_type_fixed(job_title or "", enhanced_description)
-                role_weights = self.role_weights.get(detected_role, self.role_weights["default"])
-
-                # Enhanced result with all information
-                enhanced_analysis = {
-                    **validated_job_analysis,
-                    "detected_role_type": detected_role,
-                    "role_specific_weights": role_weights,
-                    "enhancement_details": enhancement_info,
-                    "enhancement_features": {
-                        "role_detection": True,
-                        "adaptive_weighting": True,
-                        "integrated_enhancement": use_enhancement,
-                        "job_validation_applied": True
-                    }
-                }
-                
-                logger.info("✅ Job description analyzed successfully with integrated enhancement")
-                return enhanced_analysis
-                
-            except json.JSONDecodeError:
-                logger.warning("Response wasn't valid JSON, attempting to extract")
-                extracted_result = self._extract_json_from_response(response)
+            if job_analysis is None:
+                # Now analyze the (potentially enhanced) description
+                prompt = JOB_ANALYSIS_PROMPT.format_map({
+                    **JOB_PROMPT_SECTIONS,
+                    "job_title": job_title or 'Not specified',
+                    "enhanced_description": enhanced_description
+                })
+                response = await self._call_gemini(prompt, max_output_tokens=JOB_ANALYSIS_MAX_OUTPUT_TOKENS)
                 
-                # Add enhancement info even to extracted results
-                extracted_result["enhancement_details"] = enhancement_info
-                return extracted_result
+                try:
+                    job_analysis = json_loads(self._strip_code_fences(response))
+                except json.JSONDecodeError:
+                    logger.warning("Response wasn't valid JSON, attempting to extract")
+                    extracted_result = self._extract_json_from_response(response)
+                    
+                    # Add enhancement info even to extracted results
+                    extracted_result["enhancement_details"] = enhancement_info
+                    return extracted_result
+
+            # 🌟 NEW: Apply validation to job analysis as well
+            validated_job_analysis = self._validate_job_analysis(job_analysis)
+
+            # Add role detection and weights
+            detected_role = self._detect_role_type_fixed(job_title or "", enhanced_description)
+            role_weights = self.role_weights.get(detected_role, self.role_weights["default"])
+
+            # Enhanced result with all information (validation returns the freshly parsed dict)
+            enhanced_analysis = validated_job_analysis
+            enhanced_analysis.update({
+                "detected_role_type": detected_role,
+                "role_specific_weights": role_weights,
+                "enhancement_details": enhancement_info,
+                "enhancement_features": {
+                    "role_detection": True,
+                    "adaptive_weighting": True,
+                    "integrated_enhancement": use_enhancement,
+                    "job_validation_applied": True
+                }
+            })
+            
+            logger.info("✅ Job description analyzed successfully with integrated enhancement")
+            # Don't pin a result that silently fell back after a failed enhancement
+            if enhancement_info["was_enhanced"] or not use_enhancement:
+                self._analysis_cache.set(cache_key, enhanced_analysis)
+            return enhanced_analysis
                 
         except Exception as e:
-            logger.error(f"❌ Error analyzing job description: {str(e)}")
+            logger.error("❌ Error analyzing job description: %s", e)
             raise Exception(f"Failed to analyze job description: {str(e)}")
 
 
+    async def _enhance_and_analyze_job_description(self, raw_description: str, job_title: str = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """🔗 Enhance a job description and analyze the enhanced text with a single Gemini call"""
+        
+        prompt = JOB_ENHANCE_AND_ANALYZE_PROMPT.format_map({
+            **JOB_PROMPT_SECTIONS,
+            "job_title": job_title or 'Not specified',
+            "raw_description": raw_description
+        })
+        response = await self._call_gemini(prompt, max_output_tokens=JOB_ENHANCE_AND_ANALYZE_MAX_OUTPUT_TOKENS)
+        combined_result = json_loads(self._strip_code_fences(response))
+        
+        enhancement_result = combined_result.get("enhancement") if isinstance(combined_result, dict) else None
+        job_analysis = combined_result.get("analysis") if isinstance(combined_result, dict) else None
+        if (not isinstance(enhancement_result, dict) or not isinstance(job_analysis, dict)
+                or not enhancement_result.get("enhanced_description") or "error" in enhancement_result):
+            raise ValueError("Combined response is missing the enhancement or analysis section")
+        
+        # Same metadata enhance_job_description adds, so standalone callers can reuse it
+        enhancement_result["original_description"] = raw_description
+        enhancement_result["original_title"] = job_title
+        enhancement_result["enhancement_timestamp"] = self._get_timestamp()
+        self._analysis_cache.set(make_cache_key("job_enhancement", job_title, raw_description), enhancement_result)
+        
+        return enhancement_result, job_analysis
+    
     # 🌟 ADD the missing enhance_job_description method if it doesn't exist
     async def enhance_job_description(self, raw_description: str, job_title: str = None) -> Dict[str, Any]:
         """AI-powered job description enhancement and optimization"""
         
         logger.info("🔧 Enhancing job description with AI optimization")
         
-        enhancement_prompt = f"""
-    You are an expert HR professional and job description optimizer. Your task is to take a raw job description input and transform it into a clear, structured, and comprehensive job description that will enable accurate candidate matching.
-
-    RAW JOB DESCRIPTION INPUT:
-    Title: {job_title or 'Not specified'}
-    Description: {raw_description}
-
-    ENHANCEMENT REQUIREMENTS:
-    1. Clean up grammar, spelling, and formatting
-    2. Extract and organize all requirements clearly
-    3. Standardize skill terminology (e.g., "JS" → "JavaScript", "React.js" → "React")
-    4. Separate required vs preferred qualifications
-    5. PRESERVE EXACT experience level requirements (do not change "3 years" to "5 years")
-    6. Only clarify education requirements if they are vague or missing
-    7. Remove ambiguous or contradictory statements (except experience years)
-    8. Structure the content logically without changing core requirements
-
-    Return ONLY a valid JSON object with this exact structure:
-    {{
-        "enhanced_title": "Clear, specific job title",
-        "enhanced_description": "Complete, well-structured job description text",
-        "optimization_notes": "What was improved or standardized",
-        "quality_score": score_out_of_100_for_original_description
-    }}
-
-    RULES:
-    - Use specific, standardized skill names from the tech industry
-    - PRESERVE EXACT experience requirements as specified in the original (DO NOT modify years of experience)
-    - If original says "3 years" keep it as "3 years", if it says "5+ years" keep it as "5+ years"
-    - Only clarify experience requirements if they are ambiguous (e.g., "some experience" → "2-3 years")
-    - Don't add requirements that weren't implied in the original
-    - If information is missing, use null values
-    - Focus on clarity and accuracy while preserving original intent
-    - Return only the JSON, no other text
-    """
+        cache_key = make_cache_key("job_enhancement", job_title, raw_description)
+        cached_enhancement = self._analysis_cache.get(cache_key)
+        if cached_enhancement is not None:
+            logger.info("⚡ Job description enhancement served from cache")
+            return cached_enhancement
+        
+        enhancement_prompt = JOB_ENHANCEMENT_PROMPT.format_map({
+            **JOB_PROMPT_SECTIONS,
+            "job_title": job_title or 'Not specified',
+            "raw_description": raw_description
+        })
         
         try:
-            if not self.model:
-                raise Exception("Google Gemini not initialized. Check your API key.")
-            
-            response = await self._call_gemini(enhancement_prompt)
+            response = await self._call_gemini(enhancement_prompt, max_output_tokens=JOB_ENHANCEMENT_MAX_OUTPUT_TOKENS)
             
             try:
-                enhancement_result = json.loads(response)
+                enhancement_result = json_loads(self._strip_code_fences(response))
                 logger.info("✅ Job description enhanced successfully")
                 
                 # Add metadata
@@ -1006,6 +1251,7 @@ class AIAnalyzer:
                 enhancement_result["original_title"] = job_title
                 enhancement_result["enhancement_timestamp"] = self._get_timestamp()
                 
+                self._analysis_cache.set(cache_key, enhancement_result)
                 return enhancement_result
                 
             except json.JSONDecodeError:
@@ -1013,7 +1259,7 @@ class AIAnalyzer:
                 return self._extract_json_from_response(response)
                 
         except Exception as e:
-            logger.error(f"❌ Error enhancing job description: {str(e)}")
+            logger.error("❌ Error enhancing job description: %s", e)
             
             # Fallback: return basic structure with original content
             return {
@@ -1027,236 +1273,35 @@ class AIAnalyzer:
     async def analyze_resume_content(self, resume_text: str, job_analysis: Optional[Dict] = None) -> Dict[str, Any]:
         """Improved resume analysis with better JSON structure and more detailed prompts"""
         
-        job_context = ""
-        if job_analysis:
-            job_context = f"""
-
-    JOB CONTEXT: This resume is being evaluated for a position requiring:
-    - Technical Skills: {job_analysis.get('required_skills', {})}
-    - Experience Level: {job_analysis.get('minimum_experience', 'Not specified')} years
-    - Education: {job_analysis.get('education_requirements', {})}
-    - Seniority: {job_analysis.get('seniority_level', 'Not specified')}
-    """
+        job_context = self._build_resume_job_context(job_analysis)
         
-        prompt = f"""
-    You are a senior technical recruiter with 10+ years of experience analyzing software developer resumes. Your task is to extract information with HIGH ACCURACY and return ONLY a properly formatted JSON object.
-
-    ANALYSIS INSTRUCTIONS:
-    1. Read the ENTIRE resume carefully before making any assessments
-    2. Base proficiency levels on concrete evidence (project complexity, years used, professional context)
-    3. Calculate years_experience from actual work dates and project durations
-    4. Only include skills that are explicitly mentioned or clearly demonstrated
-    5. Be conservative with proficiency ratings - require strong evidence for "advanced" or "expert"
-
-    Resume Content:
-    {resume_text}
-    {job_context}
-
-    PROFICIENCY LEVEL CRITERIA (evidence-based, NOT just years):
-
-    PRIMARY CRITERIA (Use these first):
-    1. Project Complexity & Impact:
-       - "expert": Architected systems from scratch, made critical technical decisions, measurable business impact
-       - "advanced": Independently built complex features, optimized performance, solved challenging technical problems
-       - "intermediate": Built complete features with guidance, contributed to production code regularly
-       - "beginner": Worked on simple tasks, learning phase, assisted with basic implementations
-
-    2. Evidence of Mastery:
-       - "expert": Mentored others, led technical discussions, open-source contributions, technical writing
-       - "advanced": Code reviews, technical presentations, cross-team collaboration, problem-solving leadership
-       - "intermediate": Team collaboration, bug fixes, feature contributions, following best practices
-       - "beginner": Learning resources, tutorials, personal projects, guided development
-
-    SECONDARY CRITERIA (Use as supporting evidence):
-    3. Years of Experience (as reference, not requirement):
-       - "expert": Usually 5+ years, BUT can be less with exceptional depth
-       - "advanced": Usually 3-5 years, BUT can be 2 years with strong project complexity
-       - "intermediate": Usually 1-3 years, BUT can be 6 months with intensive professional use
-       - "beginner": Usually 0-1 year, includes recent learners regardless of total career length
-
-    IMPORTANT PROFICIENCY RULES:
-    - A 2-year React developer who built complex SPAs and mentored others = "advanced" or "expert"
-    - A 5-year developer who only maintains legacy code = "intermediate"
-    - Base proficiency on IMPACT and COMPLEXITY, not just duration
-    - If resume lacks evidence, default to "intermediate" for professional use, "beginner" for personal projects
-    - Look for quantified achievements: "Improved performance by 40%", "Built system serving 1M users"
-
-    CRITICAL: Return ONLY the JSON object below. No explanations, no markdown, no code blocks, just the raw JSON:
-
-    {{
-        "candidate_summary": "Brief 2-3 sentence professional summary",
-        "contact_info": {{
-            "name": "Full name or null",
-            "email": "Email address or null", 
-            "phone": "Phone number or null",
-            "linkedin": "LinkedIn profile or null",
-            "location": "City, State/Country or null",
-            "portfolio": "Portfolio website or null"
-        }},
-        "skills_by_category": {{
-            "programming_languages": [
-                {{"name": "Python", "proficiency": "advanced", "years_experience": 2}},
-                {{"name": "JavaScript", "proficiency": "intermediate", "years_experience": 1}}
-            ],
-            "web_frameworks": [
-                {{"name": "Django", "proficiency": "advanced", "years_experience": 2}},
-                {{"name": "React", "proficiency": "intermediate", "years_experience": 1}}
-            ],
-            "databases": [
-                {{"name": "MySQL", "proficiency": "intermediate", "years_experience": 1}}
-            ],
-            "cloud_platforms": [
-                {{"name": "AWS", "proficiency": "beginner", "years_experience": 1}}
-            ],
-            "devops_tools": [
-                {{"name": "Docker", "proficiency": "beginner", "years_experience": 1}}
-            ],
-            "data_tools": [],
-            "frontend_tools": [
-                {{"name": "HTML", "proficiency": "advanced", "years_experience": 2}},
-                {{"name": "CSS", "proficiency": "advanced", "years_experience": 2}}
-            ],
-            "mobile_development": [],
-            "testing_tools": [],
-            "version_control": [
-                {{"name": "Git", "proficiency": "intermediate", "years_experience": 2}}
-            ],
-            "project_management": [],
-            "other_technical": [],
-            "soft_skills": [
-                {{"name": "Team collaboration", "evidence": "Worked in Scrum teams"}},
-                {{"name": "Problem solving", "evidence": "Resolved complex backend issues"}}
-            ]
-        }},
-        "experience_analysis": {{
-            "total_years": 2.5,
-            "relevant_years": 2.5,
-            "career_progression": "junior_to_mid",
-            "industry_experience": ["healthcare", "technology"],
-            "role_types": ["individual_contributor"],
-            "company_sizes": ["mid_size"],
-            "current_level": "mid"
-        }},
-        "work_history": [
-            {{
-                "company": "Company Name",
-                "title": "Full Stack Developer", 
-                "start_date": "2024-08",
-                "end_date": "present",
-                "duration_months": 6,
-                "key_achievements": [
-                    "Developed cloud-based automated system for insurance eligibility checks",
-                    "Integrated frontend with backend APIs for real-time functionality"
-                ],
-                "technologies_used": ["Python", "React", "AWS Lambda", "Twilio"],
-                "team_size": null,
-                "role_type": "individual_contributor"
-            }}
-        ],
-        "education": {{
-            "degrees": [
-                {{
-                    "level": "Bachelor's",
-                    "field": "Computer Science", 
-                    "institution": "University Name",
-                    "graduation_year": "2022",
-                    "gpa": null,
-                    "relevant_coursework": ["Data Structures", "Algorithms"]
-                }}
-            ],
-            "certifications": []
-        }},
-        "projects": [
-            {{
-                "name": "Project Name",
-                "description": "Brief description of what it does",
-                "technologies": ["Python", "Django", "React"],
-                "role": "Full Stack Developer",
-                "impact": "Automated insurance eligibility checks"
-            }}
-        ],
-        "achievements": [],
-        "resume_quality": {{
-            "formatting_score": 75,
-            "completeness_score": 80,
-            "quantification_score": 60,
-            "ats_friendly": true,
-            "keyword_optimization": 70,
-            "overall_quality": 75,
-            "improvement_suggestions": [
-                "Add more quantified achievements",
-                "Include specific metrics and numbers"
-            ]
-        }},
-        "leadership_indicators": {{
-            "has_leadership_experience": false,
-            "team_sizes_managed": [],
-            "leadership_skills": [],
-            "leadership_evidence": []
-        }},
-        "career_insights": {{
-            "specializations": ["Full Stack Development", "Web Applications"],
-            "career_trajectory": "ascending",
-            "job_stability": "stable",
-            "learning_attitude": "continuous_learner",
-            "innovation_indicators": ["Built automated systems", "Cloud integration"],
-            "remote_work_experience": true
-        }}
-    }}
-
-    STRICT EXTRACTION GUIDELINES:
-
-    SKILLS EXTRACTION:
-    - Only include skills EXPLICITLY mentioned in the resume
-    - For years_experience: Count from first professional use to present (be precise with math)
-    - For proficiency: Require EVIDENCE - don't guess or assume
-    - Examples of evidence: "Led React development", "Optimized MySQL queries", "Architected microservices"
-    - If no evidence for proficiency level, default to "intermediate" for professional use
-
-    EXPERIENCE CALCULATION:
-    - Calculate total_years from actual employment start/end dates
-    - Calculate relevant_years as subset of total experience in technical roles
-    - For current_level: "junior" (0-2 years), "mid" (2-5 years), "senior" (5-10 years), "lead" (10+ years)
-
-    ACCURACY REQUIREMENTS:
-    - DO NOT invent information not present in the resume
-    - DO NOT extrapolate beyond what is clearly stated
-    - USE EXACT DATES when calculating durations
-    - VALIDATE your skill categorizations (e.g., React goes in web_frameworks, not programming_languages)
-
-    QUALITY SCORING:
-    - Base formatting_score on actual resume structure and organization
-    - Base completeness_score on presence of contact info, experience, education, skills
-    - Be honest about resume quality - don't inflate scores
-
-    Return ONLY the JSON object. No other text whatsoever."""
+        # The job context is the only part of job_analysis that reaches the prompt
+        cache_key = make_cache_key("resume_analysis", resume_text, job_context)
+        cached_analysis = self._analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            logger.info("⚡ Resume analysis served from cache")
+            return cached_analysis
+        
+        prompt = RESUME_ANALYSIS_PROMPT.format_map({
+            **RESUME_PROMPT_SECTIONS,
+            "resume_text": resume_text,
+            "job_context": job_context
+        })
 
         try:
-            if not self.model:
-                raise Exception("Google Gemini not initialized. Check your API key.")
-            
             response = await self._call_gemini(prompt)
             
             # Clean the response to extract only JSON
-            response_clean = response.strip()
-            
-            # Remove any markdown code blocks if present
-            if response_clean.startswith('```json'):
-                response_clean = response_clean[7:]
-            if response_clean.startswith('```'):
-                response_clean = response_clean[3:]
-            if response_clean.endswith('```'):
-                response_clean = response_clean[:-3]
-            
-            response_clean = response_clean.strip()
+            response_clean = self._strip_code_fences(response)
             
             try:
-                resume_analysis = json.loads(response_clean)
+                resume_analysis = json_loads(response_clean)
 
                 # 🌟 NEW: Accuracy validation and correction
                 validated_analysis = await self._validate_and_correct_analysis(resume_analysis, resume_text)
 
                 logger.info("✅ Enhanced resume analyzed and validated successfully")
+                self._analysis_cache.set(cache_key, validated_analysis)
                 return validated_analysis
             except json.JSONDecodeError as e:
                 logger.warning(f"JSON decode error: {e}")
@@ -1268,30 +1313,200 @@ class AIAnalyzer:
             logger.error(f"❌ Error analyzing resume: {str(e)}")
             raise Exception(f"Failed to analyze resume: {str(e)}")
     
-    async def _call_gemini(self, prompt: str) -> str:
-        """Call Google Gemini API asynchronously with enhanced configuration for better accuracy"""
+    async def analyze_resumes_batch(
+        self,
+        resume_texts: List[str],
+        job_analysis: Optional[Dict] = None,
+        batch_size: Optional[int] = None,
+        max_concurrent_batches: Optional[int] = None
+    ) -> List[Any]:
+        """
+        📦 Analyze many resumes with one Gemini call per batch of resumes
+        
+        Results line up with resume_texts. Resumes the batched response doesn't cover
+        cleanly are re-analyzed on their own; if that also fails, the entry is the
+        raised exception instead of an analysis dict.
+        """
+        
+        # Larger batches would overrun the output budget and fall back resume by resume
+        batch_size = min(batch_size or settings.resume_analysis_batch_size, MAX_RESUMES_PER_BATCH)
+        max_concurrent_batches = max_concurrent_batches or settings.resume_analysis_max_concurrent_batches
+        
+        job_context = self._build_resume_job_context(job_analysis)
+        results: List[Any] = [None] * len(resume_texts)
+        
+        # Serve what we can from cache - only misses go to Gemini, and each distinct resume only once
+        pending_indices = []
+        first_index_by_key = {}
+        duplicate_of = {}  # index -> index of the identical resume that is actually analyzed
+        for index, resume_text in enumerate(resume_texts):
+            cache_key = make_cache_key("resume_analysis", resume_text, job_context)
+            cached_analysis = self._analysis_cache.get(cache_key)
+            if cached_analysis is not None:
+                results[index] = cached_analysis
+            elif cache_key in first_index_by_key:
+                duplicate_of[index] = first_index_by_key[cache_key]
+            else:
+                first_index_by_key[cache_key] = index
+                pending_indices.append(index)
+        
+        if not pending_indices:
+            return results
+        
+        cached_count = len(resume_texts) - len(pending_indices) - len(duplicate_of)
+        logger.info(f"📦 Batch analyzing {len(pending_indices)} resumes ({cached_count} cached, {len(duplicate_of)} duplicates)")
+        semaphore = asyncio.Semaphore(max_concurrent_batches)
+        
+        async def run_batch(batch_indices: List[int]) -> None:
+            async with semaphore:
+                batch_results = await self._analyze_resume_batch(
+                    [resume_texts[index] for index in batch_indices],
+                    job_analysis,
+                    job_context
+                )
+            for index, analysis in zip(batch_indices, batch_results):
+                results[index] = analysis
+        
+        await asyncio.gather(*(
+            run_batch(pending_indices[start:start + batch_size])
+            for start in range(0, len(pending_indices), batch_size)
+        ))
+        
+        # Re-uploaded resumes get their own copy so callers can mutate results independently
+        for index, source_index in duplicate_of.items():
+            analysis = results[source_index]
+            results[index] = analysis if isinstance(analysis, Exception) else copy.deepcopy(analysis)
+        
+        return results
+    
+    async def _analyze_resume_batch(self, resume_texts: List[str], job_analysis: Optional[Dict], job_context: str) -> List[Any]:
+        """Run one batched Gemini call, falling back to single analysis for unusable entries"""
+        
+        entries_by_id = {}
+        if len(resume_texts) > 1 and self.model:
+            resumes_block = "\n".join(
+                f"[[R{number}]]\n{resume_text}\n[[/R{number}]]"
+                for number, resume_text in enumerate(resume_texts, 1)
+            )
+            
+            prompt = RESUME_BATCH_ANALYSIS_PROMPT.format_map({
+                **RESUME_PROMPT_SECTIONS,
+                "resume_count": len(resume_texts),
+                "resumes_block": resumes_block,
+                "job_context": job_context
+            })
+            
+            try:
+                output_budget = min(len(resume_texts) * RESUME_BATCH_TOKENS_PER_RESUME, GEMINI_MAX_OUTPUT_TOKENS)
+                # Truncation is tolerated here - the complete entries are salvaged below
+                response = await self._call_gemini(prompt, max_output_tokens=output_budget, allow_truncated=True)
+                
+                for position, entry in enumerate(self._parse_batch_entries(response)):
+                    if isinstance(entry, dict):
+                        entries_by_id[str(entry.pop("resume_id", f"R{position + 1}"))] = entry
+            except Exception as e:
+                logger.warning(f"⚠️ Batched resume analysis failed, analyzing individually: {e}")
+        
+        results: List[Any] = [None] * len(resume_texts)
+        fallback_indices = []
+        for index, resume_text in enumerate(resume_texts):
+            entry = entries_by_id.get(f"R{index + 1}")
+            if entry is None or not isinstance(entry.get("skills_by_category"), dict):
+                fallback_indices.append(index)
+                continue
+            
+            validated_analysis = await self._validate_and_correct_analysis(entry, resume_text)
+            self._analysis_cache.set(make_cache_key("resume_analysis", resume_text, job_context), validated_analysis)
+            results[index] = validated_analysis
+        
+        # Repair only the entries the batch couldn't produce
+        if fallback_indices:
+            fallback_results = await asyncio.gather(
+                *(self.analyze_resume_content(resume_texts[index], job_analysis) for index in fallback_indices),
+                return_exceptions=True
+            )
+            for index, analysis in zip(fallback_indices, fallback_results):
+                results[index] = analysis
+        
+        return results
+    
+    def _parse_batch_entries(self, response: str) -> List[Any]:
+        """
+        Pull the per-resume entries out of a batched response
+        A response cut off at the output limit can't be parsed whole, so the entries that
+        were completed before the cut are recovered one by one; the rest fall back
+        """
+        response_clean = self._strip_code_fences(response)
+        try:
+            batch_analysis = json_loads(response_clean)
+        except json.JSONDecodeError:
+            array_start = response_clean.find('[', response_clean.find('"results"'))
+            if '"results"' not in response_clean or array_start < 0:
+                raise
+            entries = [json_loads(entry) for entry in iter_json_objects(response_clean, array_start)]
+            logger.warning("⚠️ Batched response was incomplete, recovered %s entries", len(entries))
+            return entries
+        
+        batch_entries = batch_analysis.get("results", []) if isinstance(batch_analysis, dict) else []
+        return batch_entries if isinstance(batch_entries, list) else []
+    
+    def _build_resume_job_context(self, job_analysis: Optional[Dict]) -> str:
+        """Render the job requirements section appended to resume analysis prompts"""
+        
+        if not job_analysis:
+            return ""
+        
+        # Flush-left like the stripped prompt templates it is substituted into
+        return (
+            "\n\nJOB CONTEXT: This resume is being evaluated for a position requiring:\n"
+            f"- Technical Skills: {job_analysis.get('required_skills', {})}\n"
+            f"- Experience Level: {job_analysis.get('minimum_experience', 'Not specified')} years\n"
+            f"- Education: {job_analysis.get('education_requirements', {})}\n"
+            f"- Seniority: {job_analysis.get('seniority_level', 'Not specified')}\n"
+        )
+    
+    def _strip_code_fences(self, response: str) -> str:
+        """Remove markdown code fences Gemini sometimes wraps around JSON"""
+        
+        response_clean = response.strip()
+        
+        # Work out where the fences end, then take a single slice
+        start = 7 if response_clean.startswith('```json') else 0
+        if response_clean.startswith('```', start):
+            start += 3
+        end = len(response_clean)
+        if response_clean.endswith('```') and end - 3 >= start:
+            end -= 3
+        
+        return response_clean[start:end].strip()
+    
+    async def _call_gemini(self, prompt: str, max_output_tokens: Optional[int] = None, allow_truncated: bool = False) -> str:
+        """
+        Call Google Gemini API asynchronously with enhanced configuration for better accuracy
+        
+        max_output_tokens overrides the model's default budget for this call only;
+        the SDK merges it over the model's generation config. A response cut off at the
+        budget raises unless allow_truncated is set, so partial output is never parsed
+        and cached as if it were complete.
+        """
+        # The one model guard every analysis path goes through
         if not self.model:
             raise Exception("Google Gemini model not initialized. Check your API key in .env file.")
 
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        max_output_tokens=8000,
-                        temperature=0.15,  # Optimized for structured extraction accuracy
-                        candidate_count=1,
-                        top_p=0.85,       # Balanced for consistent structured outputs
-                        top_k=40          # Reduced for more deterministic responses
-                    )
-                )
-            )
+            # Native async call on the model's shared channel - no executor thread per request,
+            # so concurrent analyses aren't capped by the default thread pool size.
+            # The semaphore bounds in-flight requests across all analyzers to stay under rate limits
+            generation_override = {"max_output_tokens": max_output_tokens} if max_output_tokens else None
+            async with GEMINI_REQUEST_SEMAPHORE:
+                response = await self.model.generate_content_async(prompt, generation_config=generation_override)
 
             # Check if response has text and is valid
             if not hasattr(response, 'text') or not response.text:
                 raise Exception("Empty or invalid response from Gemini API")
+            
+            if not allow_truncated and response_hit_token_limit(response):
+                raise Exception("Response was cut off at the output token limit")
 
             return response.text
 
@@ -1306,72 +1521,26 @@ class AIAnalyzer:
     def _extract_json_from_response(self, response: str) -> Dict[str, Any]:
         """Extract JSON from AI response that might have extra text"""
         try:
-            start = response.find('{')
-            end = response.rfind('}') + 1
-            
-            if start != -1 and end > start:
-                json_str = response[start:end]
-                return json.loads(json_str)
-            else:
-                raise Exception("No valid JSON found in AI response")
+            json_str = find_json_object(response)
+            if json_str is None:
+                raise Exception("No complete JSON object found in AI response")
+            return json_loads(json_str)
         except Exception as e:
             logger.error(f"Failed to extract JSON from response: {str(e)}")
             # Return a proper fallback structure that matches expected resume analysis format
-            return {
-                "contact_info": {
-                    "name": "Unknown",
-                    "email": None,
-                    "phone": None,
-                    "linkedin": None,
-                    "location": None
-                },
-                "skills_by_category": {
-                    "programming_languages": [],
-                    "web_frameworks": [],
-                    "databases": [],
-                    "cloud_platforms": [],
-                    "devops_tools": [],
-                    "frontend_tools": [],
-                    "testing_tools": [],
-                    "version_control": [],
-                    "soft_skills": []
-                },
-                "work_history": [],
-                "education": {
-                    "degrees": [],
-                    "certifications": []
-                },
-                "projects": [],
-                "experience_analysis": {
-                    "total_years": 0,
-                    "relevant_years": 0,
-                    "current_level": "unknown"
-                },
-                "candidate_summary": f"Failed to parse AI response. Raw response: {response[:200]}...",
-                "resume_quality": {
-                    "overall_quality": 30,
-                    "formatting_score": 30,
-                    "completeness_score": 30
-                },
-                "leadership_indicators": {
-                    "has_leadership_experience": False,
-                    "team_sizes_managed": [],
-                    "leadership_skills": []
-                },
-                "career_insights": {
-                    "specializations": [],
-                    "career_trajectory": "unknown",
-                    "job_stability": "unknown"
-                },
-                "parsing_error": True,
-                "error_message": str(e)
-            }
+            fallback_analysis = empty_resume_analysis(
+                "Unknown",
+                f"Failed to parse AI response. Raw response: {response[:200]}..."
+            )
+            fallback_analysis["parsing_error"] = True
+            fallback_analysis["error_message"] = str(e)
+            return fallback_analysis
     
     async def _validate_and_correct_analysis(self, analysis: Dict[str, Any], resume_text: str) -> Dict[str, Any]:
         """🌟 NEW: Validate and correct analysis for better accuracy"""
 
-        # Quick validation checks
-        corrected_analysis = analysis.copy()
+        # Quick validation checks - callers pass freshly parsed JSON, so correct it in place
+        corrected_analysis = analysis
 
         # 1. Validate skill categorizations
         skills_by_category = corrected_analysis.get("skills_by_category", {})
@@ -1379,45 +1548,34 @@ class AIAnalyzer:
         # Common categorization fixes
         corrections_made = []
 
-        # Check for misplaced skills
-        programming_langs = ["python", "javascript", "java", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"]
-        web_frameworks = ["react", "angular", "vue", "django", "flask", "express", "spring", "laravel"]
-        databases = ["mysql", "postgresql", "mongodb", "redis", "sqlite", "dynamodb", "oracle"]
-
-        # Fix common categorization errors - create a new skills structure
+        # Fix common categorization errors in one pass - create a new skills structure
         corrected_skills_by_category = {}
-        skills_to_move = []
+        moved_skills = {}  # target category -> skills moved into it, in encounter order
 
-        # First pass: identify skills that need to be moved
         for category, skills in skills_by_category.items():
-            corrected_skills_by_category[category] = []
-            if isinstance(skills, list):
-                for skill_item in skills:
-                    if isinstance(skill_item, dict):
-                        skill_name = (skill_item.get("name") or "").lower()
-                        moved = False
-
-                        # Check if skill is in wrong category
-                        if category == "programming_languages" and any(fw in skill_name for fw in web_frameworks):
-                            skills_to_move.append((skill_item, "web_frameworks"))
-                            corrections_made.append(f"Moved {skill_item.get('name')} from programming_languages to web_frameworks")
-                            moved = True
-
-                        elif category == "web_frameworks" and any(pl in skill_name for pl in programming_langs):
-                            skills_to_move.append((skill_item, "programming_languages"))
-                            corrections_made.append(f"Moved {skill_item.get('name')} from web_frameworks to programming_languages")
-                            moved = True
-
-                        if not moved:
-                            corrected_skills_by_category[category].append(skill_item)
-                    else:
-                        corrected_skills_by_category[category].append(skill_item)
-
-        # Second pass: add moved skills to their correct categories
-        for skill_item, target_category in skills_to_move:
-            if target_category not in corrected_skills_by_category:
-                corrected_skills_by_category[target_category] = []
-            corrected_skills_by_category[target_category].append(skill_item)
+            if not isinstance(skills, list):
+                corrected_skills_by_category[category] = []
+                continue
+
+            fix = RESUME_CATEGORY_FIXES.get(category)
+            if fix is None:
+                corrected_skills_by_category[category] = list(skills)
+                continue
+
+            misplaced_pattern, target_category = fix
+            kept_skills = []
+            for skill_item in skills:
+                # Check if skill is in wrong category
+                if isinstance(skill_item, dict) and misplaced_pattern.search((skill_item.get("name") or "").lower()):
+                    moved_skills.setdefault(target_category, []).append(skill_item)
+                    corrections_made.append(f"Moved {skill_item.get('name')} from {category} to {target_category}")
+                else:
+                    kept_skills.append(skill_item)
+            corrected_skills_by_category[category] = kept_skills
+
+        # Moved skills go after the ones already in their correct category
+        for target_category, skills in moved_skills.items():
+            corrected_skills_by_category.setdefault(target_category, []).extend(skills)
 
         skills_by_category = corrected_skills_by_category
 
@@ -1427,11 +1585,11 @@ class AIAnalyzer:
 
         if work_history:
             # Recalculate total years more accurately
-            total_months = 0
-            for job in work_history:
-                duration = job.get("duration_months", 0)
-                if isinstance(duration, (int, float)) and duration > 0:
-                    total_months += duration
+            durations = (job.get("duration_months", 0) for job in work_history)
+            total_months = sum(
+                duration for duration in durations
+                if isinstance(duration, (int, float)) and duration > 0
+            )
 
             calculated_years = round(total_months / 12, 1)
             original_years = experience_analysis.get("total_years", 0)
@@ -1448,9 +1606,9 @@ class AIAnalyzer:
         # Check if scores are too high given the actual content
         has_contact = bool(contact_info.get("email") or contact_info.get("phone"))
         has_experience = bool(work_history)
-        has_skills = bool([s for s in skills_by_category.values() if s])
+        has_skills = any(skills_by_category.values())
 
-        completeness_factors = sum([has_contact, has_experience, has_skills])
+        completeness_factors = has_contact + has_experience + has_skills
         reasonable_completeness = min(completeness_factors * 30, 90)
 
         current_completeness = resume_quality.get("completeness_score", 50)
@@ -1468,62 +1626,45 @@ class AIAnalyzer:
         corrected_analysis["_corrections_made"] = corrections_made
 
         if corrections_made:
-            logger.info(f"🔧 Applied {len(corrections_made)} accuracy corrections: {corrections_made}")
+            logger.info("🔧 Applied %d accuracy corrections: %s", len(corrections_made), corrections_made)
 
         return corrected_analysis
 
     def _validate_job_analysis(self, job_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """🌟 NEW: Validate job analysis for accuracy"""
 
-        corrected_analysis = job_analysis.copy()
+        # Freshly parsed by the caller - corrected in place
+        corrected_analysis = job_analysis
         corrections_made = []
 
         # 1. Validate skill categorizations in job requirements
         required_skills = corrected_analysis.get("required_skills", {})
         preferred_skills = corrected_analysis.get("preferred_skills", {})
 
-        # Common skill categorization fixes
-        programming_langs = ["python", "javascript", "java", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"]
-        web_frameworks = ["react", "angular", "vue", "django", "flask", "express", "spring", "laravel", "fastapi"]
-        databases = ["mysql", "postgresql", "mongodb", "redis", "sqlite", "dynamodb", "oracle", "sql"]
-
         for skill_set_name, skill_set in [("required_skills", required_skills), ("preferred_skills", preferred_skills)]:
-            for category, skills in skill_set.items():
-                if isinstance(skills, list):
-                    corrected_skills = []
-                    for skill in skills:
-                        skill_lower = str(skill).lower()
-                        moved = False
-
-                        # Check if skill is in wrong category
-                        if category == "programming_languages" and any(fw in skill_lower for fw in web_frameworks):
-                            # Move to web_frameworks
-                            if "web_frameworks" not in skill_set:
-                                skill_set["web_frameworks"] = []
-                            skill_set["web_frameworks"].append(skill)
-                            corrections_made.append(f"Moved '{skill}' from {category} to web_frameworks in {skill_set_name}")
-                            moved = True
-
-                        elif category == "web_frameworks" and any(pl in skill_lower for pl in programming_langs):
-                            # Move to programming_languages
-                            if "programming_languages" not in skill_set:
-                                skill_set["programming_languages"] = []
-                            skill_set["programming_languages"].append(skill)
-                            corrections_made.append(f"Moved '{skill}' from {category} to programming_languages in {skill_set_name}")
-                            moved = True
-
-                        elif category == "programming_languages" and any(db in skill_lower for db in databases):
-                            # Move to databases
-                            if "databases" not in skill_set:
-                                skill_set["databases"] = []
-                            skill_set["databases"].append(skill)
-                            corrections_made.append(f"Moved '{skill}' from {category} to databases in {skill_set_name}")
-                            moved = True
-
-                        if not moved:
-                            corrected_skills.append(skill)
-
-                    skill_set[category] = corrected_skills
+            # Snapshot the items - a move below may add a category that wasn't there yet
+            for category, skills in list(skill_set.items()):
+                fixes = JOB_CATEGORY_FIXES.get(category)
+                if fixes is None or not isinstance(skills, list):
+                    continue
+
+                corrected_skills = []
+                for skill in skills:
+                    skill_lower = str(skill).lower()
+
+                    # Check if skill is in wrong category - first matching fix wins
+                    target_category = next(
+                        (target for pattern, target in fixes if pattern.search(skill_lower)),
+                        None
+                    )
+                    if target_category is None:
+                        corrected_skills.append(skill)
+                        continue
+
+                    skill_set.setdefault(target_category, []).append(skill)
+                    corrections_made.append(f"Moved '{skill}' from {category} to {target_category} in {skill_set_name}")
+
+                skill_set[category] = corrected_skills
 
         # 2. Validate experience requirements logic
         min_exp = corrected_analysis.get("minimum_experience")
@@ -1539,7 +1680,7 @@ class AIAnalyzer:
 
         # Check if seniority matches experience requirements
         if min_exp and seniority:
-            expected_seniority = "junior" if min_exp <= 2 else "mid" if min_exp <= 5 else "senior" if min_exp <= 10 else "lead"
+            expected_seniority = SENIORITY_LEVELS[bisect_left(SENIORITY_MAX_YEARS, min_exp)]
             if seniority != expected_seniority:
                 corrected_analysis["seniority_level"] = expected_seniority
                 corrections_made.append(f"Corrected seniority_level from '{seniority}' to '{expected_seniority}' based on {min_exp} years requirement")
@@ -1549,7 +1690,7 @@ class AIAnalyzer:
         corrected_analysis["_job_corrections_made"] = corrections_made
 
         if corrections_made:
-            logger.info(f"🔧 Applied {len(corrections_made)} job analysis corrections: {corrections_made}")
+            logger.info("🔧 Applied %d job analysis corrections: %s", len(corrections_made), corrections_made)
 
         return corrected_analysis
 
@@ -2,6 +2,7 @@ import PyPDF2
 import pdfplumber
 from docx import Document
 from fastapi import UploadFile, HTTPException
+import asyncio
 import io
 import re
 from typing import Optional, Dict
@@ -9,6 +10,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Compiled once - every uploaded resume goes through these
+WHITESPACE_PATTERN = re.compile(r'\s+')
+DISALLOWED_CHARS_PATTERN = re.compile(r'[^\w\s\-.,@():/\n]')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')  # Whole match only
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[\w\-]+')
+
 class DocumentParser:
     """Service for parsing various document formats and extracting text"""
     
@@ -41,18 +49,22 @@ class DocumentParser:
             logger.info(f"File size: {len(content)} bytes")
             
             if filename.endswith('.pdf'):
-                text = self._parse_pdf(content)
+                parse = self._parse_pdf
             elif filename.endswith('.docx'):
-                text = self._parse_docx(content)
+                parse = self._parse_docx
             elif filename.endswith('.doc'):
                 # For .doc files, try docx parser (some work)
-                text = self._parse_docx(content)
+                parse = self._parse_docx
             else:
                 raise HTTPException(
                     status_code=400, 
                     detail=f"Unsupported file format. Supported: {', '.join(self.supported_formats)}"
                 )
             
+            # Text extraction is blocking, CPU-heavy library code - run it in a worker thread
+            # so other requests keep being served while a large PDF is parsed
+            text = await asyncio.to_thread(parse, content)
+            
             logger.info(f"Successfully extracted {len(text)} characters")
             return text
                 
@@ -132,15 +144,12 @@ class DocumentParser:
     def _clean_text(self, text: str) -> str:
         """Clean and normalize extracted text"""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r'\s+', ' ', text)
+        # Remove excessive whitespace - every run (blank lines and \r\n included) becomes one space,
+        # so no separate blank-line or line-ending pass is needed
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         # Remove special characters that might interfere with processing
-        text = re.sub(r'[^\w\s\-.,@():/\n]', '', text)
-        
-        # Normalize line endings
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        text = DISALLOWED_CHARS_PATTERN.sub('', text)
         
         return text.strip()
     
@@ -153,20 +162,17 @@ class DocumentParser:
         }
         
         # Email regex
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
+        email_match = EMAIL_PATTERN.search(text)
         if email_match:
             contact_info["email"] = email_match.group()
         
         # Phone regex (various formats)
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?(\d{3})\)?[-.\s]?(\d{3})[-.\s]?(\d{4})'
-        phone_match = re.search(phone_pattern, text)
+        phone_match = PHONE_PATTERN.search(text)
         if phone_match:
             contact_info["phone"] = phone_match.group()
         
         # LinkedIn profile
-        linkedin_pattern = r'linkedin\.com/in/[\w\-]+'
-        linkedin_match = re.search(linkedin_pattern, text.lower())
+        linkedin_match = LINKEDIN_PATTERN.search(text.lower())
         if linkedin_match:
             contact_info["linkedin"] = linkedin_match.group()
         
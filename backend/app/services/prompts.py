@@ -0,0 +1,467 @@
+"""
+Prompt templates for the Gemini-backed analyzers
+
+The *_PROMPT templates are filled with str.format_map, so their literal
+braces are doubled. The shared RESUME_* sections are plain text that gets
+substituted in as values.
+
+Everything is written with a 4-space source indent for readability; that indent
+is stripped once at import (see the bottom of the module) so it isn't sent - and
+billed - on every request.
+"""
+import re
+
+# 📋 Shared resume-analysis sections, substituted into both the single and batched prompts
+RESUME_PROFICIENCY_CRITERIA = """\
+    PROFICIENCY LEVEL CRITERIA (evidence-based, NOT just years):
+
+    PRIMARY CRITERIA (Use these first):
+    1. Project Complexity & Impact:
+       - "expert": Architected systems from scratch, made critical technical decisions, measurable business impact
+       - "advanced": Independently built complex features, optimized performance, solved challenging technical problems
+       - "intermediate": Built complete features with guidance, contributed to production code regularly
+       - "beginner": Worked on simple tasks, learning phase, assisted with basic implementations
+
+    2. Evidence of Mastery:
+       - "expert": Mentored others, led technical discussions, open-source contributions, technical writing
+       - "advanced": Code reviews, technical presentations, cross-team collaboration, problem-solving leadership
+       - "intermediate": Team collaboration, bug fixes, feature contributions, following best practices
+       - "beginner": Learning resources, tutorials, personal projects, guided development
+
+    SECONDARY CRITERIA (Use as supporting evidence):
+    3. Years of Experience (as reference, not requirement):
+       - "expert": Usually 5+ years, BUT can be less with exceptional depth
+       - "advanced": Usually 3-5 years, BUT can be 2 years with strong project complexity
+       - "intermediate": Usually 1-3 years, BUT can be 6 months with intensive professional use
+       - "beginner": Usually 0-1 year, includes recent learners regardless of total career length
+
+    IMPORTANT PROFICIENCY RULES:
+    - A 2-year React developer who built complex SPAs and mentored others = "advanced" or "expert"
+    - A 5-year developer who only maintains legacy code = "intermediate"
+    - Base proficiency on IMPACT and COMPLEXITY, not just duration
+    - If resume lacks evidence, default to "intermediate" for professional use, "beginner" for personal projects
+    - Look for quantified achievements: "Improved performance by 40%", "Built system serving 1M users\""""
+
+RESUME_ANALYSIS_SCHEMA = """\
+    {
+        "candidate_summary": "Brief 2-3 sentence professional summary",
+        "contact_info": {
+            "name": "Full name or null",
+            "email": "Email address or null", 
+            "phone": "Phone number or null",
+            "linkedin": "LinkedIn profile or null",
+            "location": "City, State/Country or null",
+            "portfolio": "Portfolio website or null"
+        },
+        "skills_by_category": {
+            "programming_languages": [
+                {"name": "Python", "proficiency": "advanced", "years_experience": 2},
+                {"name": "JavaScript", "proficiency": "intermediate", "years_experience": 1}
+            ],
+            "web_frameworks": [
+                {"name": "Django", "proficiency": "advanced", "years_experience": 2},
+                {"name": "React", "proficiency": "intermediate", "years_experience": 1}
+            ],
+            "databases": [
+                {"name": "MySQL", "proficiency": "intermediate", "years_experience": 1}
+            ],
+            "cloud_platforms": [
+                {"name": "AWS", "proficiency": "beginner", "years_experience": 1}
+            ],
+            "devops_tools": [
+                {"name": "Docker", "proficiency": "beginner", "years_experience": 1}
+            ],
+            "data_tools": [],
+            "frontend_tools": [
+                {"name": "HTML", "proficiency": "advanced", "years_experience": 2},
+                {"name": "CSS", "proficiency": "advanced", "years_experience": 2}
+            ],
+            "mobile_development": [],
+            "testing_tools": [],
+            "version_control": [
+                {"name": "Git", "proficiency": "intermediate", "years_experience": 2}
+            ],
+            "project_management": [],
+            "other_technical": [],
+            "soft_skills": [
+                {"name": "Team collaboration", "evidence": "Worked in Scrum teams"},
+                {"name": "Problem solving", "evidence": "Resolved complex backend issues"}
+            ]
+        },
+        "experience_analysis": {
+            "total_years": 2.5,
+            "relevant_years": 2.5,
+            "career_progression": "junior_to_mid",
+            "industry_experience": ["healthcare", "technology"],
+            "role_types": ["individual_contributor"],
+            "company_sizes": ["mid_size"],
+            "current_level": "mid"
+        },
+        "work_history": [
+            {
+                "company": "Company Name",
+                "title": "Full Stack Developer", 
+                "start_date": "2024-08",
+                "end_date": "present",
+                "duration_months": 6,
+                "key_achievements": [
+                    "Developed cloud-based automated system for insurance eligibility checks",
+                    "Integrated frontend with backend APIs for real-time functionality"
+                ],
+                "technologies_used": ["Python", "React", "AWS Lambda", "Twilio"],
+                "team_size": null,
+                "role_type": "individual_contributor"
+            }
+        ],
+        "education": {
+            "degrees": [
+                {
+                    "level": "Bachelor's",
+                    "field": "Computer Science", 
+                    "institution": "University Name",
+                    "graduation_year": "2022",
+                    "gpa": null,
+                    "relevant_coursework": ["Data Structures", "Algorithms"]
+                }
+            ],
+            "certifications": []
+        },
+        "projects": [
+            {
+                "name": "Project Name",
+                "description": "Brief description of what it does",
+                "technologies": ["Python", "Django", "React"],
+                "role": "Full Stack Developer",
+                "impact": "Automated insurance eligibility checks"
+            }
+        ],
+        "achievements": [],
+        "resume_quality": {
+            "formatting_score": 75,
+            "completeness_score": 80,
+            "quantification_score": 60,
+            "ats_friendly": true,
+            "keyword_optimization": 70,
+            "overall_quality": 75,
+            "improvement_suggestions": [
+                "Add more quantified achievements",
+                "Include specific metrics and numbers"
+            ]
+        },
+        "leadership_indicators": {
+            "has_leadership_experience": false,
+            "team_sizes_managed": [],
+            "leadership_skills": [],
+            "leadership_evidence": []
+        },
+        "career_insights": {
+            "specializations": ["Full Stack Development", "Web Applications"],
+            "career_trajectory": "ascending",
+            "job_stability": "stable",
+            "learning_attitude": "continuous_learner",
+            "innovation_indicators": ["Built automated systems", "Cloud integration"],
+            "remote_work_experience": true
+        }
+    }"""
+
+RESUME_EXTRACTION_GUIDELINES = """\
+    STRICT EXTRACTION GUIDELINES:
+
+    SKILLS EXTRACTION:
+    - Only include skills EXPLICITLY mentioned in the resume
+    - For years_experience: Count from first professional use to present (be precise with math)
+    - For proficiency: Require EVIDENCE - don't guess or assume
+    - Examples of evidence: "Led React development", "Optimized MySQL queries", "Architected microservices"
+    - If no evidence for proficiency level, default to "intermediate" for professional use
+
+    EXPERIENCE CALCULATION:
+    - Calculate total_years from actual employment start/end dates
+    - Calculate relevant_years as subset of total experience in technical roles
+    - For current_level: "junior" (0-2 years), "mid" (2-5 years), "senior" (5-10 years), "lead" (10+ years)
+
+    ACCURACY REQUIREMENTS:
+    - DO NOT invent information not present in the resume
+    - DO NOT extrapolate beyond what is clearly stated
+    - USE EXACT DATES when calculating durations
+    - VALIDATE your skill categorizations (e.g., React goes in web_frameworks, not programming_languages)
+
+    QUALITY SCORING:
+    - Base formatting_score on actual resume structure and organization
+    - Base completeness_score on presence of contact info, experience, education, skills
+    - Be honest about resume quality - don't inflate scores"""
+
+RESUME_PROMPT_SECTIONS = {
+    "proficiency_criteria": RESUME_PROFICIENCY_CRITERIA,
+    "analysis_schema": RESUME_ANALYSIS_SCHEMA,
+    "extraction_guidelines": RESUME_EXTRACTION_GUIDELINES
+}
+
+# 🧾 Shared job-description sections, substituted into the job prompts below
+JOB_ANALYSIS_INSTRUCTIONS = """\
+    1. Read the job description completely before categorizing any skills
+    2. Distinguish carefully between REQUIRED (must-have) vs PREFERRED (nice-to-have) skills
+    3. Be precise with experience level requirements - if it says "3+ years" use 3, not 5
+    4. Categorize skills correctly (e.g., "React" = web_frameworks, "Python" = programming_languages)
+    5. Only include skills that are explicitly mentioned or clearly implied"""
+
+JOB_CATEGORIZATION_GUIDE = """\
+    SKILL CATEGORIZATION EXAMPLES:
+    - programming_languages: Python, JavaScript, Java, C#, Go, Rust, PHP, Ruby, TypeScript, Kotlin, Swift
+    - web_frameworks: React, Angular, Vue, Django, Flask, Express, Spring Boot, Laravel, FastAPI, Next.js
+    - databases: MySQL, PostgreSQL, MongoDB, Redis, DynamoDB, Cassandra, Oracle, SQL Server
+    - cloud_platforms: AWS, Azure, GCP, DigitalOcean, Heroku
+    - devops_tools: Docker, Kubernetes, Jenkins, GitLab CI, Terraform, Ansible, GitHub Actions
+    - frontend_tools: HTML, CSS, SASS, Webpack, Vite, Tailwind CSS, Bootstrap, Material-UI
+    - testing_tools: Jest, Pytest, JUnit, Selenium, Cypress, Mocha, TestNG
+
+    ⚠️ COMMON CATEGORIZATION MISTAKES TO AVOID (ANTI-PATTERNS):
+    - ❌ WRONG: Putting "React" in programming_languages → ✅ CORRECT: React belongs in web_frameworks
+    - ❌ WRONG: Putting "SQL" or "MySQL" in web_frameworks → ✅ CORRECT: SQL/MySQL belong in databases
+    - ❌ WRONG: Putting "JavaScript" in web_frameworks → ✅ CORRECT: JavaScript belongs in programming_languages
+    - ❌ WRONG: Putting "HTML/CSS" in programming_languages → ✅ CORRECT: HTML/CSS belong in frontend_tools
+    - ❌ WRONG: Putting "Django" in programming_languages → ✅ CORRECT: Django belongs in web_frameworks
+    - ❌ WRONG: Putting "Docker" in cloud_platforms → ✅ CORRECT: Docker belongs in devops_tools
+    - ❌ WRONG: Putting "Git/GitHub" in devops_tools → ✅ CORRECT: Git/GitHub belong in version_control
+    - ❌ WRONG: Categorizing soft skills like "Team Player", "Communication" as technical skills → ✅ CORRECT: Use soft_skills category
+    - ❌ WRONG: Changing "3 years experience" to "5 years" → ✅ CORRECT: Use EXACT numbers from job description
+    - ❌ WRONG: Adding skills not mentioned in the job description → ✅ CORRECT: Only extract explicitly stated skills
+
+    VALIDATION CHECKLIST (Review before returning):
+    ✓ Are all programming languages in programming_languages category?
+    ✓ Are all frameworks (React, Django, etc.) in web_frameworks category?
+    ✓ Are all databases in databases category?
+    ✓ Did I preserve the EXACT experience years from the job description?
+    ✓ Did I only include skills explicitly mentioned?"""
+
+JOB_ANALYSIS_SCHEMA = """\
+    {
+        "required_skills": {
+            "programming_languages": ["list of required programming languages"],
+            "web_frameworks": ["list of required web frameworks"],
+            "databases": ["list of required databases"],
+            "cloud_platforms": ["list of required cloud platforms"],
+            "devops_tools": ["list of required DevOps tools"],
+            "data_tools": ["list of required data science/ML tools"],
+            "frontend_tools": ["list of required frontend tools"],
+            "mobile_development": ["list of mobile development requirements"],
+            "testing_tools": ["list of testing frameworks/tools"],
+            "version_control": ["list of version control systems"],
+            "project_management": ["list of project management methodologies"],
+            "other_technical": ["other technical skills not in above categories"],
+            "soft_skills": ["communication", "leadership", "teamwork", etc.]
+        },
+        "preferred_skills": {
+            "programming_languages": ["nice-to-have programming languages"],
+            "web_frameworks": ["nice-to-have frameworks"],
+            "databases": ["nice-to-have databases"],
+            "cloud_platforms": ["nice-to-have cloud platforms"],
+            "devops_tools": ["nice-to-have DevOps tools"],
+            "data_tools": ["nice-to-have data tools"],
+            "other_technical": ["other nice-to-have technical skills"],
+            "soft_skills": ["nice-to-have soft skills"]
+        },
+        "minimum_experience": number_of_years_required_or_null,
+        "preferred_experience": number_of_years_preferred_or_null,
+        "education_requirements": {
+            "required_degree": "Bachelor's/Master's/PhD or null",
+            "preferred_degree": "Bachelor's/Master's/PhD or null",
+            "field_of_study": ["Computer Science", "Engineering", etc.],
+            "certifications": ["list of required/preferred certifications"]
+        },
+        "key_responsibilities": ["main job duties and responsibilities"],
+        "industry": "industry or domain",
+        "seniority_level": "junior/mid/senior/lead/principal/executive",
+        "remote_work": "remote/hybrid/onsite/flexible",
+        "team_size": "size of team they'll work with or null",
+        "role_type": "individual_contributor/team_lead/manager/director",
+        "summary": "comprehensive summary of the ideal candidate profile"
+    }"""
+
+JOB_EXTRACTION_RULES = """\
+    STRICT EXTRACTION RULES:
+    - Extract ONLY skills explicitly mentioned - do not infer or add related skills
+    - Categorize skills using the examples above as reference
+    - For required vs preferred: "must have", "required", "essential" = required; "nice to have", "preferred", "bonus" = preferred
+    - For experience: Use EXACT numbers stated ("3+ years" = 3, "5-7 years" = 5, "minimum 2 years" = 2)
+    - For seniority_level: Base on experience requirements and job title (0-2 years = junior, 2-5 = mid, 5-10 = senior, 10+ = lead/principal)
+    - Use null for missing information - do not guess or assume
+    - Validate your categorizations - common mistakes: React in programming_languages (should be web_frameworks), SQL in web_frameworks (should be databases)"""
+
+JOB_ENHANCEMENT_REQUIREMENTS = """\
+    1. Clean up grammar, spelling, and formatting
+    2. Extract and organize all requirements clearly
+    3. Standardize skill terminology (e.g., "JS" → "JavaScript", "React.js" → "React")
+    4. Separate required vs preferred qualifications
+    5. PRESERVE EXACT experience level requirements (do not change "3 years" to "5 years")
+    6. Only clarify education requirements if they are vague or missing
+    7. Remove ambiguous or contradictory statements (except experience years)
+    8. Structure the content logically without changing core requirements"""
+
+JOB_ENHANCEMENT_SCHEMA = """\
+    {
+        "enhanced_title": "Clear, specific job title",
+        "enhanced_description": "Complete, well-structured job description text",
+        "optimization_notes": "What was improved or standardized",
+        "quality_score": score_out_of_100_for_original_description
+    }"""
+
+JOB_ENHANCEMENT_RULES = """\
+    - Use specific, standardized skill names from the tech industry
+    - PRESERVE EXACT experience requirements as specified in the original (DO NOT modify years of experience)
+    - If original says "3 years" keep it as "3 years", if it says "5+ years" keep it as "5+ years"
+    - Only clarify experience requirements if they are ambiguous (e.g., "some experience" → "2-3 years")
+    - Don't add requirements that weren't implied in the original
+    - If information is missing, use null values
+    - Focus on clarity and accuracy while preserving original intent"""
+
+JOB_PROMPT_SECTIONS = {
+    "analysis_instructions": JOB_ANALYSIS_INSTRUCTIONS,
+    "categorization_guide": JOB_CATEGORIZATION_GUIDE,
+    "analysis_schema": JOB_ANALYSIS_SCHEMA,
+    "extraction_rules": JOB_EXTRACTION_RULES,
+    "enhancement_requirements": JOB_ENHANCEMENT_REQUIREMENTS,
+    "enhancement_schema": JOB_ENHANCEMENT_SCHEMA,
+    "enhancement_rules": JOB_ENHANCEMENT_RULES
+}
+
+# 🎯 Job description analysis: job_title, enhanced_description + JOB_PROMPT_SECTIONS
+JOB_ANALYSIS_PROMPT = """
+    You are an expert HR analyst specializing in technical job requirements. Analyze this job description with HIGH PRECISION and extract detailed information. Return ONLY a valid JSON object.
+
+    ANALYSIS INSTRUCTIONS:
+{analysis_instructions}
+
+    Job Title: {job_title}
+    Job Description:
+    {enhanced_description}
+
+{categorization_guide}
+
+    Return exactly this JSON structure:
+{analysis_schema}
+
+{extraction_rules}
+    - Return only the JSON, no other text or explanations
+    """
+
+# 🔧 Job description enhancement: job_title, raw_description + JOB_PROMPT_SECTIONS
+JOB_ENHANCEMENT_PROMPT = """
+    You are an expert HR professional and job description optimizer. Your task is to take a raw job description input and transform it into a clear, structured, and comprehensive job description that will enable accurate candidate matching.
+
+    RAW JOB DESCRIPTION INPUT:
+    Title: {job_title}
+    Description: {raw_description}
+
+    ENHANCEMENT REQUIREMENTS:
+{enhancement_requirements}
+
+    Return ONLY a valid JSON object with this exact structure:
+{enhancement_schema}
+
+    RULES:
+{enhancement_rules}
+    - Return only the JSON, no other text
+    """
+
+# 🔗 Enhancement + analysis in one call: job_title, raw_description + JOB_PROMPT_SECTIONS
+JOB_ENHANCE_AND_ANALYZE_PROMPT = """
+    You are an expert HR professional and technical job requirements analyst. Complete TWO steps in a single response: first transform the raw job description below into a clear, structured and comprehensive job description, then analyze YOUR ENHANCED VERSION with HIGH PRECISION. Return ONLY a valid JSON object.
+
+    RAW JOB DESCRIPTION INPUT:
+    Title: {job_title}
+    Description: {raw_description}
+
+    STEP 1 - ENHANCEMENT REQUIREMENTS:
+{enhancement_requirements}
+
+    ENHANCEMENT RULES:
+{enhancement_rules}
+
+    STEP 2 - ANALYSIS INSTRUCTIONS (apply to the enhanced description from step 1):
+{analysis_instructions}
+
+{categorization_guide}
+
+    Return exactly this JSON structure, with the step 1 result under "enhancement" and the step 2 result under "analysis":
+    {{
+        "enhancement": <enhancement object>,
+        "analysis": <analysis object>
+    }}
+
+    Enhancement object structure:
+{enhancement_schema}
+
+    Analysis object structure:
+{analysis_schema}
+
+{extraction_rules}
+    - Return only the JSON, no other text or explanations
+    """
+
+# 📄 Single resume analysis: resume_text, job_context + RESUME_PROMPT_SECTIONS
+RESUME_ANALYSIS_PROMPT = """
+    You are a senior technical recruiter with 10+ years of experience analyzing software developer resumes. Your task is to extract information with HIGH ACCURACY and return ONLY a properly formatted JSON object.
+
+    ANALYSIS INSTRUCTIONS:
+    1. Read the ENTIRE resume carefully before making any assessments
+    2. Base proficiency levels on concrete evidence (project complexity, years used, professional context)
+    3. Calculate years_experience from actual work dates and project durations
+    4. Only include skills that are explicitly mentioned or clearly demonstrated
+    5. Be conservative with proficiency ratings - require strong evidence for "advanced" or "expert"
+
+    Resume Content:
+    {resume_text}
+    {job_context}
+
+{proficiency_criteria}
+
+    CRITICAL: Return ONLY the JSON object below. No explanations, no markdown, no code blocks, just the raw JSON:
+
+{analysis_schema}
+
+{extraction_guidelines}
+
+    Return ONLY the JSON object. No other text whatsoever."""
+
+# 📦 Batched resume analysis: resume_count, resumes_block, job_context + RESUME_PROMPT_SECTIONS
+RESUME_BATCH_ANALYSIS_PROMPT = """
+    You are a senior technical recruiter with 10+ years of experience analyzing software developer resumes. You will receive {resume_count} resumes, each wrapped in [[Rn]] ... [[/Rn]] markers. Analyze EACH resume independently with HIGH ACCURACY and return ONLY a properly formatted JSON object.
+
+    ANALYSIS INSTRUCTIONS:
+    1. Read the ENTIRE resume carefully before making any assessments
+    2. Base proficiency levels on concrete evidence (project complexity, years used, professional context)
+    3. Calculate years_experience from actual work dates and project durations
+    4. Only include skills that are explicitly mentioned or clearly demonstrated
+    5. Be conservative with proficiency ratings - require strong evidence for "advanced" or "expert"
+    6. NEVER mix information between resumes
+
+    Resumes:
+    {resumes_block}
+    {job_context}
+
+{proficiency_criteria}
+
+    CRITICAL: Return ONLY a JSON object of the form {{"results": [...]}} with exactly one entry per resume, in input order. Each entry must contain a "resume_id" field ("R1", "R2", ...) plus every field of the per-resume schema below. No explanations, no markdown, no code blocks, just the raw JSON.
+
+    PER-RESUME SCHEMA:
+{analysis_schema}
+
+{extraction_guidelines}
+
+    Return ONLY the JSON object. No other text whatsoever."""
+
+# ✂️ Drop the 4-space source indent once at import; nested JSON keeps its relative indentation
+SOURCE_INDENT_PATTERN = re.compile(r'^ {4}', re.MULTILINE)
+
+
+def strip_source_indent(text: str) -> str:
+    return SOURCE_INDENT_PATTERN.sub('', text).strip()
+
+
+RESUME_PROMPT_SECTIONS = {name: strip_source_indent(text) for name, text in RESUME_PROMPT_SECTIONS.items()}
+JOB_PROMPT_SECTIONS = {name: strip_source_indent(text) for name, text in JOB_PROMPT_SECTIONS.items()}
+JOB_ANALYSIS_PROMPT = strip_source_indent(JOB_ANALYSIS_PROMPT)
+JOB_ENHANCEMENT_PROMPT = strip_source_indent(JOB_ENHANCEMENT_PROMPT)
+JOB_ENHANCE_AND_ANALYZE_PROMPT = strip_source_indent(JOB_ENHANCE_AND_ANALYZE_PROMPT)
+RESUME_ANALYSIS_PROMPT = strip_source_indent(RESUME_ANALYSIS_PROMPT)
+RESUME_BATCH_ANALYSIS_PROMPT = strip_source_indent(RESUME_BATCH_ANALYSIS_PROMPT)
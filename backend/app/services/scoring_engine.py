@@ -1,13 +1,60 @@
-from app.services.ai_analyzer import AIAnalyzer
+from app.services.ai_analyzer import AIAnalyzer, empty_resume_analysis, find_json_object, json_loads
 from app.core.config import settings
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 import asyncio
 from datetime import datetime
+from functools import lru_cache
 import math
+import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Base score for a matched skill at each proficiency level
+PROFICIENCY_SCORES = {
+    "expert": 100,
+    "advanced": 90,
+    "intermediate": 80,
+    "beginner": 60
+}
+
+# How much each kind of match is trusted
+MATCH_TYPE_MODIFIERS = {
+    "exact": 1.0,
+    "synonym": 0.95,
+    "related": 0.85
+}
+
+# Improved default weights for unknown roles
+DEFAULT_ROLE_WEIGHTS = {
+    "programming_languages": 0.25,
+    "web_frameworks": 0.20,
+    "databases": 0.15,
+    "cloud_platforms": 0.12,
+    "devops_tools": 0.10,
+    "frontend_tools": 0.10,
+    "testing_tools": 0.05,
+    "version_control": 0.03
+}
+
+# Missing skills containing one of these are flagged as critical
+CRITICAL_SKILLS = ("python", "javascript", "react", "java", "sql", "aws", "docker", "git")
+
+# Phrases that signal a technology was introduced or modernized
+TECH_INTRO_PHRASES = (
+    "introduced", "migrated to", "adopted", "implemented new",
+    "modernized", "transformed", "revolutionized"
+)
+
+# Words that mark a sentence as describing an achievement
+ACHIEVEMENT_KEYWORDS = ("increased", "reduced", "improved", "achieved")
+
+TEAM_SIZE_PATTERN = re.compile(r'team of (\d+)|(\d+) people|(\d+) developers|(\d+) engineers')
+PERCENTAGE_PATTERN = re.compile(r'(\d+)%')
+MONEY_PATTERN = re.compile(r'\$[\d,]+|\d+k|\d+ million')
+DIGIT_PATTERN = re.compile(r'\d+')
+
 class ScoringEngine:
     """
     Enhanced scoring engine with intelligent skill matching and career analysis
@@ -105,6 +152,13 @@ class ScoringEngine:
             }
         }
         
+        # Role weights never change at runtime, so normalize them once up front
+        self._normalized_role_weights = {
+            role: self._normalize_weights(weights)
+            for role, weights in self.role_specific_weights.items()
+        }
+        self._normalized_default_weights = self._normalize_weights(DEFAULT_ROLE_WEIGHTS)
+        
         # Skill intelligence database for synonym and relationship matching
         self.skill_intelligence = {
             "synonyms": {
@@ -153,6 +207,17 @@ class ScoringEngine:
             }
         }
         
+        # Flat synonym -> canonical index; the first canonical listing a synonym wins,
+        # matching the old in-order scan in _normalize_skill
+        self._skill_synonym_index = {}
+        for normalized_name, synonyms in self.skill_intelligence["synonyms"].items():
+            for synonym in synonyms:
+                self._skill_synonym_index.setdefault(synonym, normalized_name)
+        
+        # Job role detection depends only on the job, so every resume scored against
+        # the same posting reuses the first result
+        self._classify_job_role_cached = lru_cache(maxsize=256)(self._classify_job_role)
+        
         # Experience quality indicators for enhanced analysis
         self.experience_quality_indicators = {
             "leadership_keywords": [
@@ -206,88 +271,38 @@ class ScoringEngine:
     def _create_fallback_analysis(self, error_message: str) -> Dict[str, Any]:
         """Create a fallback analysis structure when AI analysis fails"""
 
-        return {
-            "contact_info": {
-                "name": "Analysis Failed",
-                "email": None,
-                "phone": None,
-                "linkedin": None,
-                "location": None
-            },
-            "skills_by_category": {
-                "programming_languages": [],
-                "web_frameworks": [],
-                "databases": [],
-                "cloud_platforms": [],
-                "devops_tools": [],
-                "frontend_tools": [],
-                "testing_tools": [],
-                "version_control": [],
-                "soft_skills": []
-            },
-            "work_history": [],
-            "education": {
-                "degrees": [],
-                "certifications": []
-            },
-            "projects": [],
-            "experience_analysis": {
-                "total_years": 0,
-                "relevant_years": 0,
-                "current_level": "unknown"
-            },
-            "candidate_summary": f"AI Analysis failed: {error_message[:200]}...",
-            "resume_quality": {
-                "overall_quality": 30,
-                "formatting_score": 30,
-                "completeness_score": 30
-            },
-            "leadership_indicators": {
-                "has_leadership_experience": False,
-                "team_sizes_managed": [],
-                "leadership_skills": []
-            },
-            "career_insights": {
-                "specializations": [],
-                "career_trajectory": "unknown",
-                "job_stability": "unknown"
-            },
-            "analysis_error": True,
-            "error_message": error_message
-        }
+        fallback_analysis = empty_resume_analysis("Analysis Failed", f"AI Analysis failed: {error_message[:200]}...")
+        fallback_analysis["analysis_error"] = True
+        fallback_analysis["error_message"] = error_message
+        return fallback_analysis
 
     def _get_role_specific_weights_fixed(self, detected_role: str) -> dict:
         """
         🎯 IMPROVED: Get role-specific weights with normalization
         """
 
-        # Get role-specific weights or a balanced default
-        if detected_role in self.role_specific_weights:
-            weights = self.role_specific_weights[detected_role].copy()
-        else:
-            # Improved default weights for unknown roles
-            weights = {
-                "programming_languages": 0.25,
-                "web_frameworks": 0.20,
-                "databases": 0.15,
-                "cloud_platforms": 0.12,
-                "devops_tools": 0.10,
-                "frontend_tools": 0.10,
-                "testing_tools": 0.05,
-                "version_control": 0.03
-            }
+        # Get role-specific weights or a balanced default (normalized in __init__)
+        weights = self._normalized_role_weights.get(detected_role, self._normalized_default_weights)
+
+        # Hand out a copy so callers can't alter the shared table
+        return dict(weights)
+
+    def _normalize_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
+        """🌟 FIXED: Normalize weights to sum to 1.0"""
 
-        # 🌟 FIXED: Normalize weights to sum to 1.0
         total_weight = sum(weights.values())
         if total_weight > 0:
             weights = {k: v / total_weight for k, v in weights.items()}
+        else:
+            weights = dict(weights)
 
         return weights
     async def score_resume_against_job(
         self, 
         resume_text: str, 
         job_analysis: Dict[str, Any], 
-        filename: str = "resume.pdf"
+        filename: str = "resume.pdf",
+        resume_analysis: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         🎯 ENHANCED RESUME SCORING - Main orchestration method
@@ -298,19 +313,23 @@ class ScoringEngine:
         3. Experience Quality Analysis
         4. Red Flag Detection
         5. Enhanced Insights Generation
+        
+        Pass resume_analysis to reuse an analysis that was already produced
+        (e.g. by a batched call) instead of analyzing the resume again.
         """
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         logger.info(f"🧮 Enhanced scoring resume: {filename}")
         
         try:
             # Step 1: Enhanced resume analysis with job context
-            logger.info(f"🔍 Calling AI analyzer for resume analysis: {filename}")
             try:
-                resume_analysis = await self.ai_analyzer.analyze_resume_content(
-                    resume_text,
-                    job_analysis
-                )
+                if resume_analysis is None:
+                    logger.info(f"🔍 Calling AI analyzer for resume analysis: {filename}")
+                    resume_analysis = await self.ai_analyzer.analyze_resume_content(
+                        resume_text,
+                        job_analysis
+                    )
                 logger.info(f"📋 AI analyzer returned type: {type(resume_analysis)}")
 
                 # Defensive programming: Ensure resume_analysis is a dictionary
@@ -322,13 +341,10 @@ class ScoringEngine:
                     if isinstance(resume_analysis, str):
                         # If it's a string, try to extract any JSON from it
                         try:
-                            import json
                             # Try to find JSON in the string
-                            start = resume_analysis.find('{')
-                            end = resume_analysis.rfind('}') + 1
-                            if start != -1 and end > start:
-                                json_str = resume_analysis[start:end]
-                                resume_analysis = json.loads(json_str)
+                            json_str = find_json_object(resume_analysis)
+                            if json_str is not None:
+                                resume_analysis = json_loads(json_str)
                                 logger.info("✅ Successfully extracted JSON from string response")
                             else:
                                 raise Exception("No JSON found in string response")
@@ -465,7 +481,7 @@ class ScoringEngine:
                 insights = {"strengths": [], "concerns": [], "detailed_analysis": f"Analysis failed: {str(e)}"}
             
             # Step 10: Compile comprehensive enhanced results
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             result = {
                 "filename": filename,
@@ -699,6 +715,18 @@ class ScoringEngine:
         # Combine job-related text for analysis
         combined_text = f"{job_title} {job_description} {seniority_level}".lower()
 
+        # Lowercased required skill names (hashable, so the result can be memoized)
+        required_skill_names = tuple(
+            tuple(str(skill).lower() for skill in skills_list)
+            for skills_list in required_skills.values()
+            if isinstance(skills_list, list)
+        )
+
+        return self._classify_job_role_cached(combined_text, required_skill_names)
+
+    def _classify_job_role(self, combined_text: str, required_skill_names: Tuple[Tuple[str, ...], ...]) -> str:
+        """Pick the job role type from the combined job text and its required skill names"""
+
         logger.info(f"🎯 Detecting JOB ROLE TYPE from job requirements (not candidate background)")
 
         # 🌟 Technology detection for JOB REQUIREMENTS
@@ -739,20 +767,18 @@ class ScoringEngine:
         ]
 
         # Count required skills from JOB (not candidate)
-        def count_job_requirements(tech_list, job_skills_dict, text):
+        def count_job_requirements(tech_list, job_skill_names, text):
             count = 0
             matches = []
 
             # Check JOB required skills
-            for category_name, skills_list in job_skills_dict.items():
-                if isinstance(skills_list, list):
-                    for skill in skills_list:
-                        skill_lower = str(skill).lower()
-                        for tech in tech_list:
-                            if tech in skill_lower or skill_lower in tech:
-                                count += 1
-                                matches.append(skill_lower)
-                                break
+            for skills_list in job_skill_names:
+                for skill_lower in skills_list:
+                    for tech in tech_list:
+                        if tech in skill_lower or skill_lower in tech:
+                            count += 1
+                            matches.append(skill_lower)
+                            break
 
             # Check job description text
             for tech in tech_list:
@@ -762,11 +788,11 @@ class ScoringEngine:
 
             return count, list(set(matches))  # Remove duplicates
 
-        frontend_count, frontend_matches = count_job_requirements(frontend_techs, required_skills, combined_text)
-        backend_count, backend_matches = count_job_requirements(backend_techs, required_skills, combined_text)
-        devops_count, devops_matches = count_job_requirements(devops_techs, required_skills, combined_text)
-        data_count, data_matches = count_job_requirements(data_techs, required_skills, combined_text)
-        mobile_count, mobile_matches = count_job_requirements(mobile_techs, required_skills, combined_text)
+        frontend_count, frontend_matches = count_job_requirements(frontend_techs, required_skill_names, combined_text)
+        backend_count, backend_matches = count_job_requirements(backend_techs, required_skill_names, combined_text)
+        devops_count, devops_matches = count_job_requirements(devops_techs, required_skill_names, combined_text)
+        data_count, data_matches = count_job_requirements(data_techs, required_skill_names, combined_text)
+        mobile_count, mobile_matches = count_job_requirements(mobile_techs, required_skill_names, combined_text)
 
         # Check for explicit fullstack indicators in JOB description
         fullstack_explicit = any(indicator in combined_text for indicator in fullstack_indicators)
@@ -905,25 +931,13 @@ class ScoringEngine:
             
             if matched and match_info:
                 # Calculate proficiency-based score
-                proficiency_scores = {
-                    "expert": 100,
-                    "advanced": 90,
-                    "intermediate": 80,
-                    "beginner": 60
-                }
-                
-                base_score = proficiency_scores.get(match_info["proficiency"], 80)
+                base_score = PROFICIENCY_SCORES.get(match_info["proficiency"], 80)
                 
                 # Years experience bonus
                 years_bonus = min(match_info["years"] * 2, 10)  # Up to 10 point bonus
                 
                 # Match type modifier
-                type_modifiers = {
-                    "exact": 1.0,
-                    "synonym": 0.95,
-                    "related": 0.85
-                }
-                type_modifier = type_modifiers.get(match_type, 0.8)
+                type_modifier = MATCH_TYPE_MODIFIERS.get(match_type, 0.8)
                 
                 final_score = min((base_score + years_bonus) * type_modifier, 100)
                 
@@ -938,8 +952,7 @@ class ScoringEngine:
                 })
             else:
                 # Determine criticality
-                critical_skills = ["python", "javascript", "react", "java", "sql", "aws", "docker", "git"]
-                is_critical = any(cs in required_skill.lower() for cs in critical_skills)
+                is_critical = any(cs in required_skill.lower() for cs in CRITICAL_SKILLS)
                 
                 missing.append({
                     "skill": required_skill,
@@ -971,11 +984,7 @@ class ScoringEngine:
         skill_lower = skill.lower().strip()
         
         # Check synonyms database
-        for normalized_name, synonyms in self.skill_intelligence["synonyms"].items():
-            if skill_lower in synonyms:
-                return normalized_name
-        
-        return skill_lower
+        return self._skill_synonym_index.get(skill_lower, skill_lower)
     
     def _skills_are_related(self, skill1: str, skill2: str) -> bool:
         """🔗 Check if skills are related using relationship database"""
@@ -1055,11 +1064,12 @@ class ScoringEngine:
             for job in work_history
         ])
         
-        # Quality analysis
-        leadership_score = self._analyze_leadership_experience(experience_text)
-        impact_score = self._analyze_quantified_impact(experience_text)
-        innovation_score = self._analyze_innovation_indicators(experience_text)
-        scale_score = self._analyze_scale_experience(experience_text)
+        # Quality analysis - lowercase once and share it across the scanners
+        experience_text_lower = experience_text.lower()
+        leadership_score = self._analyze_leadership_experience(experience_text, experience_text_lower)
+        impact_score = self._analyze_quantified_impact(experience_text, experience_text_lower)
+        innovation_score = self._analyze_innovation_indicators(experience_text, experience_text_lower)
+        scale_score = self._analyze_scale_experience(experience_text, experience_text_lower)
         
         # Calculate quality bonuses
         leadership_bonus = min(leadership_score * 0.3, 15)    # Up to 15 points
@@ -1080,7 +1090,7 @@ class ScoringEngine:
             "impact_score": impact_score,
             "innovation_score": innovation_score,
             "scale_score": scale_score,
-            "quantified_achievements": self._extract_quantified_achievements(experience_text),
+            "quantified_achievements": self._extract_quantified_achievements(experience_text, experience_text_lower),
             "analysis": {
                 "years_gap": relevant_years - min_required,
                 "quality_indicators_found": sum([
@@ -1112,10 +1122,11 @@ class ScoringEngine:
         else:
             return 45  # Well below requirement
     
-    def _analyze_leadership_experience(self, text: str) -> float:
+    def _analyze_leadership_experience(self, text: str, text_lower: Optional[str] = None) -> float:
         """🎯 Analyze leadership experience from text"""
         
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         leadership_score = 0
         
         for keyword in self.experience_quality_indicators["leadership_keywords"]:
@@ -1123,27 +1134,26 @@ class ScoringEngine:
                 leadership_score += 10
         
         # Look for team size indicators
-        import re
-        team_size_matches = re.findall(r'team of (\d+)|(\d+) people|(\d+) developers|(\d+) engineers', text_lower)
+        team_size_matches = TEAM_SIZE_PATTERN.findall(text_lower)
         if team_size_matches:
             max_team_size = max([int(match[0] or match[1] or match[2] or match[3]) for match in team_size_matches])
             leadership_score += min(max_team_size * 5, 30)  # Up to 30 points for large teams
         
         return min(leadership_score, 100)
     
-    def _analyze_quantified_impact(self, text: str) -> float:
+    def _analyze_quantified_impact(self, text: str, text_lower: Optional[str] = None) -> float:
         """📈 Analyze quantified achievements and impact"""
         
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         impact_score = 0
         
         # Look for quantified results
-        import re
-        percentage_matches = re.findall(r'(\d+)%', text)
+        percentage_matches = PERCENTAGE_PATTERN.findall(text)
         if percentage_matches:
             impact_score += len(percentage_matches) * 15
         
-        money_matches = re.findall(r'\$[\d,]+|\d+k|\d+ million', text_lower)
+        money_matches = MONEY_PATTERN.findall(text_lower)
         if money_matches:
             impact_score += len(money_matches) * 20
         
@@ -1153,10 +1163,11 @@ class ScoringEngine:
         
         return min(impact_score, 100)
     
-    def _analyze_innovation_indicators(self, text: str) -> float:
+    def _analyze_innovation_indicators(self, text: str, text_lower: Optional[str] = None) -> float:
         """🚀 Analyze innovation and creation indicators"""
         
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         innovation_score = 0
         
         for keyword in self.experience_quality_indicators["innovation_keywords"]:
@@ -1164,21 +1175,17 @@ class ScoringEngine:
                 innovation_score += 10
         
         # Look for technology introductions
-        tech_intro_patterns = [
-            "introduced", "migrated to", "adopted", "implemented new",
-            "modernized", "transformed", "revolutionized"
-        ]
-        
-        for pattern in tech_intro_patterns:
+        for pattern in TECH_INTRO_PHRASES:
             if pattern in text_lower:
                 innovation_score += 12
         
         return min(innovation_score, 100)
     
-    def _analyze_scale_experience(self, text: str) -> float:
+    def _analyze_scale_experience(self, text: str, text_lower: Optional[str] = None) -> float:
         """⚡ Analyze large-scale system experience"""
         
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         scale_score = 0
         
         for keyword in self.experience_quality_indicators["scale_keywords"]:
@@ -1187,17 +1194,19 @@ class ScoringEngine:
         
         return min(scale_score, 100)
     
-    def _extract_quantified_achievements(self, text: str) -> List[str]:
+    def _extract_quantified_achievements(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """📊 Extract specific quantified achievements"""
         
+        if text_lower is None:
+            text_lower = text.lower()
+        
         achievements = []
-        import re
         
-        # Find sentences with numbers and impact words
-        sentences = text.split('.')
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in ["increased", "reduced", "improved", "achieved"]):
-                if re.search(r'\d+', sentence):
+        # Find sentences with numbers and impact words (lowercasing never adds or removes a '.',
+        # so the two splits line up sentence for sentence)
+        for sentence, sentence_lower in zip(text.split('.'), text_lower.split('.')):
+            if any(keyword in sentence_lower for keyword in ACHIEVEMENT_KEYWORDS):
+                if DIGIT_PATTERN.search(sentence):
                     achievements.append(sentence.strip())
         
         return achievements[:5]  # Return top 5
@@ -1651,19 +1660,34 @@ Overall Assessment: {"Strong candidate recommended for interview" if len(concern
     ) -> Dict[str, Any]:
         """Enhanced batch processing with parallel execution for better performance"""
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         logger.info(f"🚀 Enhanced batch scoring {len(resume_data_list)} resumes")
         
         results = []
         successful_count = 0
         
+        # Analyze the whole pool up front with batched AI calls
+        try:
+            resume_analyses = await self.ai_analyzer.analyze_resumes_batch(
+                [resume_data["text"] for resume_data in resume_data_list],
+                job_analysis
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Batched resume analysis failed, scoring individually: {str(e)}")
+            resume_analyses = [None] * len(resume_data_list)
+        
         # Process resumes with enhanced error handling
-        for resume_data in resume_data_list:
+        for resume_data, resume_analysis in zip(resume_data_list, resume_analyses):
+            if isinstance(resume_analysis, Exception):
+                logger.error(f"❌ Error in AI analysis for {resume_data['filename']}: {str(resume_analysis)}")
+                resume_analysis = self._create_fallback_analysis(str(resume_analysis))
+            
             try:
                 score_result = await self.score_resume_against_job(
                     resume_data["text"],
                     job_analysis,
-                    resume_data["filename"]
+                    resume_data["filename"],
+                    resume_analysis=resume_analysis
                 )
                 results.append(score_result)
                 successful_count += 1
@@ -1684,7 +1708,7 @@ Overall Assessment: {"Strong candidate recommended for interview" if len(concern
         # Enhanced analytics
         valid_scores = [r.get("overall_score", 0) for r in results if r.get("overall_score", 0) > 0]
         
-        processing_time = (datetime.now() - start_time).total_seconds()
+        processing_time = time.perf_counter() - start_time
         
         batch_result = {
             "total_resumes": len(resume_data_list),